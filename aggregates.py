@@ -0,0 +1,90 @@
+# aggregates.py
+"""Consistency check of the team totals against the matches.
+
+``teams.matches_played/points_for/points_against`` are maintained by deltas
+(Match.record_score/update_score). ``check()`` recomputes them from the
+matches in a single aggregate query (each played match seen once from each
+side, grouped by team) and returns the teams whose stored values differ;
+``repair()`` rewrites only those rows, recomputing the totals in the same
+set-based statements. Used by ``flask check-aggregates``.
+"""
+from sqlalchemy import func, or_, select, union_all, update
+
+import locks
+from extensions import db
+from models.match import Match
+from models.team import Team
+
+FIELDS = ('matches_played', 'points_for', 'points_against')
+
+
+def _computed_totals():
+    played = (Match.score1.isnot(None), Match.score2.isnot(None))
+    sides = union_all(
+        select(Match.team1_id.label('team_id'),
+               Match.score1.label('scored'),
+               Match.score2.label('conceded')).where(*played),
+        select(Match.team2_id.label('team_id'),
+               Match.score2.label('scored'),
+               Match.score1.label('conceded')).where(*played),
+    ).subquery('sides')
+
+    return select(
+        sides.c.team_id,
+        func.count().label('matches_played'),
+        func.sum(sides.c.scored).label('points_for'),
+        func.sum(sides.c.conceded).label('points_against'),
+    ).group_by(sides.c.team_id).subquery('computed')
+
+
+def check():
+    """Teams whose stored totals differ from the matches.
+
+    Returns a list of dicts ``{'id', 'name', 'stored': {...}, 'computed': {...}}``.
+    """
+    computed = _computed_totals()
+    expected = {field: func.coalesce(computed.c[field], 0) for field in FIELDS}
+    rows = db.session.execute(
+        select(Team.id, Team.name,
+               Team.matches_played, Team.points_for, Team.points_against,
+               *(expected[field].label(f'computed_{field}') for field in FIELDS))
+        .outerjoin(computed, computed.c.team_id == Team.id)
+        .where(or_(*(func.coalesce(getattr(Team, field), 0) != expected[field] for field in FIELDS)))
+        .order_by(Team.id)
+    ).all()
+
+    return [{
+        'id': row.id,
+        'name': row.name,
+        'stored': {field: getattr(row, field) for field in FIELDS},
+        'computed': {field: getattr(row, f'computed_{field}') for field in FIELDS},
+    } for row in rows]
+
+
+def repair():
+    """Rewrite the drifted team totals from the matches; return the number of teams fixed.
+
+    The totals are recomputed by the UPDATE statements themselves (never from
+    an earlier ``check()``), so a score recorded since the check is not
+    overwritten with stale values.
+    """
+    computed = _computed_totals()
+    options = {'synchronize_session': False}
+    with locks.exclusive_transaction('aggregates'):
+        # Teams with played matches: UPDATE ... FROM the computed totals
+        fixed = db.session.execute(
+            update(Team)
+            .where(Team.id == computed.c.team_id)
+            .where(or_(*(func.coalesce(getattr(Team, field), 0) != computed.c[field] for field in FIELDS)))
+            .values(**{field: computed.c[field] for field in FIELDS}),
+            execution_options=options,
+        ).rowcount
+        # Teams without any played match
+        fixed += db.session.execute(
+            update(Team)
+            .where(Team.id.notin_(select(computed.c.team_id)))
+            .where(or_(*(func.coalesce(getattr(Team, field), 0) != 0 for field in FIELDS)))
+            .values(**{field: 0 for field in FIELDS}),
+            execution_options=options,
+        ).rowcount
+    return fixed
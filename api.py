@@ -0,0 +1,223 @@
+# api.py
+"""Read-only JSON API (``/api/v1``) for scoreboards and the club website.
+
+All endpoints serve the same per-revision cached data as the HTML views
+(cache.py) and support:
+
+- conditional GETs: the ETag is the tournament revision, so a poll with a
+  matching ``If-None-Match`` costs a single query and returns ``304``
+  (one more on a single team or round, which must exist: ``404`` otherwise);
+- cursor pagination on lists: ``?limit=50`` then ``?cursor=<next_cursor>``;
+  a cursor is bound to the revision it was issued for and answers ``409``
+  once the data changed (restart from the first page);
+- field selection on list items: ``?fields=id,name,points_for``.
+
+``/search?q=`` serves the navbar autocomplete (search.py).
+"""
+import base64
+import binascii
+import json
+
+from flask import Blueprint, Response, g, jsonify, request
+
+import cache
+import search as team_search
+import standings as standings_index
+from extensions import db
+from models.round import Round
+from models.team import Team
+
+bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify(error=error.message), error.status
+
+
+@bp.errorhandler(404)
+def handle_not_found(error):
+    return jsonify(error="Ressource introuvable."), 404
+
+
+def _etag():
+    return f'r{g.tournament.revision}'
+
+
+def _not_modified():
+    """Return a 304 response when the client already has the current revision."""
+    if request.if_none_match.contains(_etag()):
+        response = Response(status=304)
+        response.set_etag(_etag())
+        return response
+    return None
+
+
+def _json(payload):
+    response = jsonify(payload)
+    response.set_etag(_etag())
+    # Clients may keep the payload but must revalidate (cheap) on every poll
+    response.cache_control.no_cache = True
+    return response
+
+
+def encode_cursor(revision, offset):
+    raw = json.dumps({'r': revision, 'o': offset}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return int(data['r']), int(data['o'])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ApiError(400, "Curseur invalide.")
+
+
+def _limit():
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError(400, "Le paramètre limit doit être un entier.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _select_fields(items):
+    fields = request.args.get('fields')
+    if not fields or not items:
+        return items
+    wanted = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = set(wanted) - set(items[0])
+    if unknown:
+        raise ApiError(400, f"Champs inconnus : {', '.join(sorted(unknown))}.")
+    return [{field: item[field] for field in wanted} for item in items]
+
+
+def paginate(items):
+    """Slice ``items`` according to ``cursor``/``limit``; return the page and the next cursor."""
+    revision = g.tournament.revision
+    offset = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        cursor_revision, offset = decode_cursor(cursor)
+        if cursor_revision != revision:
+            raise ApiError(409, "Les données ont changé depuis ce curseur, reprenez depuis le début.")
+
+    limit = _limit()
+    page = items[offset:offset + limit]
+    next_cursor = encode_cursor(revision, offset + limit) if offset + limit < len(items) else None
+    return _select_fields(page), next_cursor
+
+
+@bp.route('/standings')
+def standings():
+    not_modified = _not_modified()
+    if not_modified:
+        return not_modified
+
+    tournament = g.tournament
+    items, next_cursor = paginate(cache.get_ranking(tournament))
+    return _json({
+        'revision': tournament.revision,
+        'ranking_system': tournament.ranking_system,
+        'items': items,
+        'next_cursor': next_cursor,
+    })
+
+
+@bp.route('/rounds')
+def rounds():
+    """Scores by round: one row per team, ``scores`` aligned with ``rounds``."""
+    not_modified = _not_modified()
+    if not_modified:
+        return not_modified
+
+    tournament = g.tournament
+    teams_scores, round_numbers = cache.get_scores_by_round(tournament)
+    rows = [{
+        'team_id': team_score['team_id'],
+        'team_name': team_score['team_name'],
+        'points_for': team_score['team_points_for'],
+        'scores': [team_score[f'round_{round_num}'] for round_num in round_numbers],
+    } for team_score in teams_scores]
+
+    items, next_cursor = paginate(rows)
+    return _json({
+        'revision': tournament.revision,
+        'rounds': round_numbers,
+        'items': items,
+        'next_cursor': next_cursor,
+    })
+
+
+@bp.route('/rounds/<int:round_number>/matches')
+def round_matches(round_number):
+    # Before the ETag, like team(); unknown rounds would also each add a cache entry
+    if db.session.query(Round.id).filter_by(number=round_number).first() is None:
+        raise ApiError(404, "Tour introuvable.")
+    not_modified = _not_modified()
+    if not_modified:
+        return not_modified
+
+    tournament = g.tournament
+    items, next_cursor = paginate(cache.get_round_matches(tournament, round_number))
+    return _json({
+        'revision': tournament.revision,
+        'round_number': round_number,
+        'items': items,
+        'next_cursor': next_cursor,
+    })
+
+
+@bp.route('/search')
+def search():
+    """Teams and players whose name has a word starting with ``q``."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        raise ApiError(400, "Le paramètre q est obligatoire.")
+    not_modified = _not_modified()
+    if not_modified:
+        return not_modified
+
+    limit = min(_limit(), team_search.MAX_LIMIT) if 'limit' in request.args else team_search.DEFAULT_LIMIT
+    return _json({
+        'revision': g.tournament.revision,
+        'query': query,
+        'items': team_search.search(g.tournament, query, limit),
+    })
+
+
+@bp.route('/teams/<int:team_id>')
+def team(team_id):
+    # Before the ETag: an unknown team is a 404, never a 304
+    team = db.session.get(Team, team_id)
+    if not team:
+        raise ApiError(404, "Équipe introuvable.")
+    not_modified = _not_modified()
+    if not_modified:
+        return not_modified
+
+    tournament = g.tournament
+
+    return _json({
+        'revision': tournament.revision,
+        'id': team.id,
+        'name': team.name,
+        'players': [player.name for player in team.players],
+        'matches_played': team.matches_played,
+        'points_for': team.points_for,
+        'points_against': team.points_against,
+        'rank': standings_index.get_index(tournament).rank(team.id),
+        'matches': cache.get_team_matches(tournament, team.id),
+    })
@@ -0,0 +1,140 @@
+# archive.py
+"""Archiving of a finished tournament, and player history across archives.
+
+``archive_tournament`` reads the live tables with three plain SELECTs, stores
+them (teams, players, matches, final standings) as one compressed snapshot,
+bulk-inserts one ``PlayerRecord`` per player and resets the live tables with
+set-based statements, all in a single transaction under the
+``round_transition`` lock (see locks.py).
+
+``player_history`` aggregates the ``player_records`` index only; snapshots are
+decompressed just to show one archived tournament.
+"""
+from sqlalchemy import func, insert, select
+
+from extensions import db
+from locks import exclusive_transaction
+from models.archive import PlayerRecord, TournamentArchive
+from models.match import Match
+from models.team import Player, Team
+from search import fold
+
+
+def _team_results(matches):
+    """``{team_id: [wins, draws, losses]}`` from played match rows."""
+    results = {}
+    for row in matches:
+        if row.score1 is None or row.score2 is None:
+            continue
+        for team_id, scored, conceded in ((row.team1_id, row.score1, row.score2),
+                                          (row.team2_id, row.score2, row.score1)):
+            counts = results.setdefault(team_id, [0, 0, 0])
+            counts[0 if scored > conceded else 1 if scored == conceded else 2] += 1
+    return results
+
+
+def archive_tournament(tournament, name, progress=None):
+    """Archive the current tournament under ``name`` and reset it; return the archive.
+
+    Runs under the ``round_transition`` lock, like round generation, so no round
+    or result is created between the read of the live tables and their reset.
+    ``progress(percent, message)`` is called before the lock is taken: it updates
+    the job row on another connection, which the SQLite write lock would block.
+    """
+    if progress:
+        progress(10, "Archivage et remise à zéro du tournoi")
+
+    with exclusive_transaction('round_transition'):
+        teams = db.session.execute(
+            select(Team.id, Team.name, Team.matches_played, Team.points_for, Team.points_against)
+        ).all()
+        players = db.session.execute(select(Player.id, Player.name, Player.team_id)).all()
+        matches = db.session.execute(
+            select(Match.round_number, Match.table_number, Match.team1_id, Match.team2_id,
+                   Match.score1, Match.score2, Match.date)
+            .order_by(Match.round_number, Match.table_number)
+        ).all()
+        standings = [team.id for team in tournament.get_ranking()]
+        ranks = {team_id: rank for rank, team_id in enumerate(standings, start=1)}
+        team_names = {team.id: team.name for team in teams}
+
+        archive = TournamentArchive(
+            name=name,
+            ranking_system=tournament.ranking_system,
+            team_count=len(teams),
+            match_count=len(matches),
+            round_count=len({row.round_number for row in matches}),
+            winner=team_names.get(standings[0]) if standings and matches else None,
+            snapshot=TournamentArchive.pack({
+                'version': TournamentArchive.SNAPSHOT_VERSION,
+                'ranking_system': tournament.ranking_system,
+                'teams': [list(row) for row in teams],
+                'players': [list(row) for row in players],
+                'matches': [list(row) for row in matches],
+                'standings': standings,
+            }),
+        )
+        db.session.add(archive)
+        db.session.flush()
+
+        results = _team_results(matches)
+        team_rows = {team.id: team for team in teams}
+        records = []
+        for player in players:
+            team = team_rows[player.team_id]
+            wins, draws, losses = results.get(team.id, (0, 0, 0))
+            records.append({
+                'archive_id': archive.id,
+                'player_key': fold(player.name),
+                'player_name': player.name,
+                'team_name': team.name,
+                'rank': ranks.get(team.id, len(teams)),
+                'matches_played': team.matches_played or 0,
+                'wins': wins,
+                'draws': draws,
+                'losses': losses,
+                'points_for': team.points_for or 0,
+                'points_against': team.points_against or 0,
+            })
+        if records:
+            db.session.execute(insert(PlayerRecord), records)
+
+        tournament.clear_results()
+    return archive
+
+
+def list_archives():
+    return TournamentArchive.query.with_entities(
+        TournamentArchive.id, TournamentArchive.name, TournamentArchive.archived_at,
+        TournamentArchive.team_count, TournamentArchive.match_count,
+        TournamentArchive.round_count, TournamentArchive.winner,
+    ).order_by(TournamentArchive.archived_at.desc()).all()
+
+
+def player_history(query=None, limit=50):
+    """Players' totals across archived tournaments, from the records index.
+
+    ``query`` filters on the folded player name prefix (uses the index on
+    ``player_key``).
+    """
+    statement = select(
+        PlayerRecord.player_key,
+        func.max(PlayerRecord.player_name).label('player_name'),
+        func.count().label('tournaments'),
+        func.min(PlayerRecord.rank).label('best_rank'),
+        func.sum(PlayerRecord.matches_played).label('matches_played'),
+        func.sum(PlayerRecord.wins).label('wins'),
+        func.sum(PlayerRecord.draws).label('draws'),
+        func.sum(PlayerRecord.losses).label('losses'),
+        func.sum(PlayerRecord.points_for).label('points_for'),
+        func.sum(PlayerRecord.points_against).label('points_against'),
+    ).group_by(PlayerRecord.player_key)
+
+    if query:
+        prefix = fold(query).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        statement = statement.where(PlayerRecord.player_key.like(f'{prefix}%', escape='\\'))
+
+    statement = statement.order_by(
+        func.sum(PlayerRecord.wins).desc(), func.sum(PlayerRecord.points_for).desc()
+    ).limit(limit)
+    return db.session.execute(statement).all()
@@ -0,0 +1,120 @@
+# assets.py
+"""Static asset pipeline.
+
+`flask build-assets` copies every CSS/JS/SVG file of ``static/`` into
+``static/dist/`` under a content-fingerprinted name (``css/base.3f2a1b9c.css``),
+writes gzip and brotli variants next to it and records the mapping in
+``static/dist/manifest.json``.  Templates reference assets through
+``asset_url('css/base.css')``; the fingerprinted files are served by the
+``assets`` blueprint with an immutable, year-long ``Cache-Control`` so a phone
+that already loaded a page only downloads the dynamic HTML afterwards.
+
+Without a manifest (development checkout) ``asset_url`` falls back to the
+plain ``/static/`` URL.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import Blueprint, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip variants are always produced
+    brotli = None
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ASSET_EXTENSIONS = ('.css', '.js', '.svg')
+ONE_YEAR = 365 * 24 * 3600
+
+# Precompressed variants, by order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+bp = Blueprint('assets', __name__)
+
+
+def _fingerprinted_name(name, content):
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    root, ext = os.path.splitext(name)
+    return f'{root}.{digest}{ext}'
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def build_assets(static_folder):
+    """Fingerprint and precompress the static assets, return the manifest."""
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        if os.path.abspath(root).startswith(os.path.abspath(dist_folder)):
+            continue
+        for filename in sorted(files):
+            if not filename.endswith(ASSET_EXTENSIONS):
+                continue
+            source = os.path.join(root, filename)
+            name = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                content = f.read()
+
+            target_name = _fingerprinted_name(name, content)
+            target = os.path.join(dist_folder, target_name)
+            _write(target, content)
+            _write(target + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write(target + '.br', brotli.compress(content, quality=11))
+            manifest[name] = target_name
+
+    _write(os.path.join(dist_folder, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def asset_url(name):
+    """URL of a static asset, fingerprinted when the asset pipeline has run."""
+    fingerprinted = current_app.extensions['assets_manifest'].get(name)
+    if fingerprinted is None:
+        return url_for('static', filename=name)
+    return url_for('assets.serve_asset', filename=fingerprinted)
+
+
+@bp.route('/assets/<path:filename>')
+def serve_asset(filename):
+    dist_folder = os.path.join(current_app.static_folder, DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    served, content_encoding = filename, None
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(dist_folder, filename + suffix)):
+            served, content_encoding = filename + suffix, encoding
+            break
+
+    response = send_from_directory(dist_folder, served, mimetype=mimetype, max_age=ONE_YEAR)
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    # Read once in the factory, i.e. before gunicorn forks its workers
+    app.extensions['assets_manifest'] = load_manifest(app.static_folder)
+    app.add_template_global(asset_url)
+    app.register_blueprint(bp)
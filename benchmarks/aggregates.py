@@ -0,0 +1,84 @@
+"""Aggregate check: time ``flask check-aggregates`` on a large tournament.
+
+Seeds ``--teams`` teams and ``--rounds`` rounds (1000 × 100 = 50 000 matches by
+default), introduces drift on a few teams, then checks that the set-based
+recompute finds exactly those teams within ``--budget-ms`` and that the
+repair leaves no drift. Exit code 1 on failure.
+
+``--database-url`` runs on another database (e.g. a local PostgreSQL)
+instead of a temporary SQLite file; every table of that database is dropped,
+hence the mandatory ``--wipe``.
+
+    python -m benchmarks.aggregates --teams 1000 --rounds 100
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, select, update
+
+from benchmarks.common import add_database_arguments, make_app
+from extensions import db
+from models.match import Match
+from models.score_event import ScoreEvent
+from models.team import Team
+import aggregates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--drift', type=int, default=5, help="Nombre d'équipes faussées")
+    parser.add_argument('--budget-ms', type=float, default=1000)
+    add_database_arguments(parser)
+    args = parser.parse_args(argv)
+
+    app = make_app(teams=args.teams, rounds=args.rounds, finish_last_round=False,
+                   database_url=args.database_url, wipe=args.wipe)
+    failures = []
+    with app.app_context():
+        match_count = db.session.scalar(select(func.count()).select_from(Match))
+
+        # Scores go through the model: totals stay consistent and are journaled
+        first, second = Match.query.filter(Match.score1.is_(None)).order_by(Match.id).limit(2).all()
+        first.record_score(90, 72)
+        first.update_score(72, 90)
+        second.update_score(100, 62)  # correction of a match without result
+        events = db.session.scalar(select(func.count()).select_from(ScoreEvent))
+        if events != 3:
+            failures.append(f"{events} événements journalisés au lieu de 3")
+
+        drifted = db.session.execute(
+            select(Team.id).order_by(Team.id).limit(args.drift)
+        ).scalars().all()
+        db.session.execute(
+            update(Team).where(Team.id.in_(drifted)).values(points_for=Team.points_for + 7)
+        )
+        db.session.commit()
+
+        start = time.perf_counter()
+        drift = aggregates.check()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{match_count} matchs, {args.teams} équipes : vérification en {elapsed:.0f} ms "
+              f"(budget {args.budget_ms:.0f} ms), {len(drift)} équipe(s) incohérente(s)")
+
+        if sorted(item['id'] for item in drift) != sorted(drifted):
+            failures.append(f"équipes détectées {[item['id'] for item in drift]} au lieu de {drifted}")
+        if elapsed > args.budget_ms:
+            failures.append(f"vérification trop lente ({elapsed:.0f} ms)")
+
+        fixed = aggregates.repair()
+        if fixed != len(drifted):
+            failures.append(f"{fixed} équipe(s) corrigée(s) au lieu de {len(drifted)}")
+        remaining = aggregates.check()
+        if remaining:
+            failures.append(f"{len(remaining)} équipe(s) toujours incohérente(s) après réparation")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Helpers shared by the benchmarks: a throw-away app seeded with a tournament."""
+import os
+import tempfile
+
+from sqlalchemy import event, text
+
+from app import create_app
+from bootstrap import bootstrap_database
+from extensions import db
+from seed import seed_tournament
+
+
+def add_database_arguments(parser):
+    """``--database-url`` and the ``--wipe`` confirmation it requires."""
+    parser.add_argument('--database-url',
+                        help="Base à utiliser au lieu d'un fichier SQLite temporaire (ENTIÈREMENT VIDÉE)")
+    parser.add_argument('--wipe', action='store_true',
+                        help="Confirmer que la base de --database-url est jetable et peut être vidée")
+
+
+def make_app(teams=64, rounds=5, finish_last_round=True, database_url=None, wipe=False, **config):
+    """Create an app on a fresh database seeded with a demo tournament.
+
+    Without ``database_url`` a temporary SQLite file is used. A given
+    ``database_url`` is wiped (every table dropped), so it is refused unless
+    ``wipe`` confirms it is a throw-away database. The caller owns the
+    returned app; the temporary directory lives as long as the process.
+    """
+    if database_url is None:
+        tmp = tempfile.mkdtemp(prefix='belote-bench-')
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    elif not wipe:
+        raise SystemExit(f"{database_url} serait entièrement vidée (toutes les tables supprimées) : "
+                         "relancez avec --wipe si c'est une base jetable.")
+
+    config.setdefault('SECRET_KEY', 'benchmark')
+    config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app = create_app(config)
+
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+        bootstrap_database('admin', 'admin')
+        seed_tournament(teams=teams, rounds=rounds, finish_last_round=finish_last_round)
+
+    return app
+
+
+def login(client, username='admin', password='admin'):
+    response = client.post('/login', data={'username': username, 'password': password})
+    assert response.status_code == 302, response.status_code
+    return client
+
+
+class QueryCounter:
+    """Count the SQL statements sent to the database inside a ``with`` block."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
@@ -0,0 +1,49 @@
+"""Response compression benchmark: bytes saved and CPU cost per request.
+
+    python -m benchmarks.compression --teams 120 --rounds 15
+"""
+import argparse
+import time
+
+from benchmarks.common import make_app
+
+PAGES = ('/ranking', '/matches')
+ENCODINGS = ('identity', 'gzip', 'br')
+
+
+def measure(client, path, encoding, requests):
+    headers = {'Accept-Encoding': encoding}
+    size = len(client.get(path, headers=headers).data)
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, headers=headers).close()
+    cpu = (time.process_time() - cpu) * 1000 / requests
+    wall = (time.perf_counter() - wall) * 1000 / requests
+    return size, cpu, wall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=120)
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    app = make_app(teams=args.teams, rounds=args.rounds)
+    client = app.test_client()
+
+    print(f"{'page':<10} {'encoding':<9} {'bytes':>9} {'saved':>7} {'cpu ms/req':>11} {'wall ms/req':>12}")
+    for path in PAGES:
+        baseline = None
+        for encoding in ENCODINGS:
+            size, cpu, wall = measure(client, path, encoding, args.requests)
+            if baseline is None:
+                baseline = (size, cpu)
+            saved = 100 * (1 - size / baseline[0])
+            print(f"{path:<10} {encoding:<9} {size:>9} {saved:>6.1f}% {cpu:>11.2f} {wall:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Concurrency check: parallel "generate next round" requests create one round.
+
+Fires ``--threads`` simultaneous POSTs of the "Générer le prochain tour" form
+against the in-process app (SQLite file by default, or ``--database-url`` for
+a local PostgreSQL) and fails (exit code 1) unless exactly one round with one
+match per table was created. Every table of the ``--database-url`` database
+is dropped first, hence the mandatory ``--wipe``.
+
+    python -m benchmarks.concurrent_rounds --threads 16 --attempts 5
+"""
+import argparse
+import sys
+import threading
+
+from sqlalchemy import func
+
+from benchmarks.common import add_database_arguments, login, make_app
+from extensions import db
+from models.job import Job
+from models.match import Match
+from models.round import Round
+
+
+def fire(app, threads):
+    clients = [login(app.test_client()) for _ in range(threads)]
+    barrier = threading.Barrier(threads)
+    statuses = []
+
+    def worker(client):
+        barrier.wait()
+        response = client.post('/matches', data={'generate_next_round': '1'})
+        statuses.append(response.status_code)
+
+    workers = [threading.Thread(target=worker, args=(client,)) for client in clients]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=40)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--attempts', type=int, default=5)
+    add_database_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Jobs run inside the requests, so the round is generated when the POSTs return
+    app = make_app(teams=args.teams, rounds=1, database_url=args.database_url, wipe=args.wipe, JOBS_SYNC=True)
+    failures = 0
+    for attempt in range(1, args.attempts + 1):
+        with app.app_context():
+            rounds_before = Round.query.count()
+            db.session.query(Job).delete()
+            db.session.commit()
+
+        statuses = fire(app, args.threads)
+
+        with app.app_context():
+            rounds_after = Round.query.count()
+            current = Round.current().number
+            per_round = db.session.query(func.count(Match.id)).filter(Match.round_number == current).scalar()
+            done = Job.query.filter_by(status=Job.STATUS_DONE).count()
+            # Score the new round so that the next attempt can generate another one
+            for match in Match.query.filter(Match.score1.is_(None)):
+                match.record_score(80, 82)
+
+        ok = rounds_after == rounds_before + 1 and per_round == args.teams // 2
+        failures += not ok
+        print(f"attempt {attempt}: {done} generated, {len(statuses) - done} refused, "
+              f"rounds {rounds_before} -> {rounds_after}, {per_round} matches in round {current}"
+              + ('' if ok else '  FAIL'))
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
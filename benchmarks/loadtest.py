@@ -0,0 +1,271 @@
+"""Load test modelling tournament-day traffic.
+
+Three kinds of virtual users run in threads:
+
+- spectators poll ``/ranking`` and a random ``/team/<id>`` page for the whole
+  run, with a short think time between requests;
+- halfway through, scorekeepers post the results of every match of the current
+  round as fast as they can (the end-of-round burst on ``record_match``);
+- once all scores are in, the admin posts ``generate_next_round``.
+
+Without ``--url`` the app runs in-process on a seeded database (temporary
+SQLite, or ``--database-url`` for a local PostgreSQL: every table of that
+database is dropped first, hence the mandatory ``--wipe``). With ``--url``
+the same scenario drives a running instance (e.g. gunicorn) over HTTP: it
+must contain a tournament with an unplayed round and an admin account.
+
+Reports throughput, p50/p95/p99 latency and error rate per endpoint.
+
+    python -m benchmarks.loadtest --spectators 200 --duration 30
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --password secret --json
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+
+
+class InProcessClient:
+    """Flask test client with the interface of HttpClient."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.data
+
+    def post(self, path, data):
+        response = self.client.post(path, data=data)
+        return response.status_code, response.data
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Minimal cookie-aware HTTP client (redirects are not followed)."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect
+        )
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path, data):
+        body = urllib.parse.urlencode(data).encode('utf-8')
+        return self._open(urllib.request.Request(self.base_url + path, data=body, method='POST'))
+
+
+class Stats:
+    """Thread-safe latency samples and error counts per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def timed(self, endpoint, call, ok=(200, 302, 304)):
+        start = time.perf_counter()
+        try:
+            status, body = call()
+        except Exception:
+            status, body = None, b''
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            if status not in ok:
+                self.errors[endpoint] += 1
+        return status, body
+
+    def summary(self, duration):
+        rows = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            if len(samples) > 1:
+                cuts = statistics.quantiles(samples, n=100, method='inclusive')
+                p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+            else:
+                p50 = p95 = p99 = samples[0]
+            rows[endpoint] = {
+                'requests': len(samples),
+                'rps': round(len(samples) / duration, 1),
+                'p50_ms': round(p50, 1),
+                'p95_ms': round(p95, 1),
+                'p99_ms': round(p99, 1),
+                'error_rate': round(self.errors[endpoint] / len(samples), 4),
+            }
+        return rows
+
+
+def login(client, username, password):
+    status, _ = client.post('/login', data={'username': username, 'password': password})
+    if status != 302:
+        raise SystemExit(f"Connexion de {username} impossible (statut {status}).")
+    return client
+
+
+def discover(client):
+    """Team ids and unplayed matches of the current round, through the JSON API."""
+    status, body = client.get('/api/v1/standings?limit=500&fields=id')
+    team_ids = [item['id'] for item in json.loads(body)['items']] if status == 200 else []
+    status, body = client.get('/api/v1/rounds?limit=1')
+    rounds = json.loads(body)['rounds'] if status == 200 else []
+    if not team_ids or not rounds:
+        raise SystemExit("Aucun tournoi en cours : créez des équipes et un premier tour.")
+
+    unplayed, cursor = [], None
+    while True:
+        path = f'/api/v1/rounds/{rounds[-1]}/matches?limit=500'
+        if cursor:
+            path += f'&cursor={cursor}'
+        payload = json.loads(client.get(path)[1])
+        unplayed += [item['id'] for item in payload['items'] if item['score1'] is None]
+        cursor = payload['next_cursor']
+        if not cursor:
+            return team_ids, unplayed
+
+
+def spectator(make_client, stats, team_ids, stop, think_time, rng):
+    client = make_client()
+    while not stop.is_set():
+        stats.timed('GET /ranking', lambda: client.get('/ranking'))
+        team_id = rng.choice(team_ids)
+        stats.timed('GET /team/<id>', lambda: client.get(f'/team/{team_id}'))
+        stop.wait(rng.uniform(0, 2 * think_time))
+
+
+def scorekeeper(client, stats, match_ids, rng):
+    for match_id in match_ids:
+        data = {
+            'record_match': '1',
+            'match_id': match_id,
+            'score1': rng.randint(40, 162),
+            'score2': rng.randint(40, 162),
+            'idempotency_key': uuid.uuid4().hex,
+        }
+        # A successful entry redirects; a re-rendered form (200) means it was refused
+        stats.timed('POST record_match', lambda: client.post('/matches', data=data), ok=(302,))
+
+
+def run(make_client, args):
+    stats = Stats()
+    admin = login(make_client(), args.username, args.password)
+    team_ids, unplayed = discover(admin)
+    print(f"{len(team_ids)} équipes, {len(unplayed)} matchs à saisir, "
+          f"{args.spectators} spectateurs, {args.scorekeepers} arbitres, {args.duration:.0f} s")
+
+    stop = threading.Event()
+    spectators = [
+        threading.Thread(target=spectator,
+                         args=(make_client, stats, team_ids, stop, args.think_time, random.Random(i)))
+        for i in range(args.spectators)
+    ]
+    start = time.perf_counter()
+    for thread in spectators:
+        thread.start()
+
+    # Fin de tour : rafale de saisies puis génération du tour suivant
+    time.sleep(args.duration / 2)
+    scorekeepers = [
+        threading.Thread(target=scorekeeper,
+                         args=(login(make_client(), args.username, args.password), stats,
+                               unplayed[i::args.scorekeepers], random.Random(1000 + i)))
+        for i in range(args.scorekeepers)
+    ]
+    burst_start = time.perf_counter()
+    for thread in scorekeepers:
+        thread.start()
+    for thread in scorekeepers:
+        thread.join()
+    burst = time.perf_counter() - burst_start
+
+    stats.timed('POST generate_next_round',
+                lambda: admin.post('/matches', data={'generate_next_round': '1'}), ok=(302,))
+
+    remaining = args.duration - (time.perf_counter() - start)
+    if remaining > 0:
+        time.sleep(remaining)
+    stop.set()
+    for thread in spectators:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    return {
+        'spectators': args.spectators,
+        'scorekeepers': args.scorekeepers,
+        'teams': len(team_ids),
+        'duration_s': round(duration, 1),
+        'burst_s': round(burst, 2),
+        'endpoints': stats.summary(duration),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="Instance à tester (par défaut : application en mémoire)")
+    parser.add_argument('--database-url',
+                        help="Base à utiliser au lieu d'un fichier SQLite temporaire (ENTIÈREMENT VIDÉE)")
+    parser.add_argument('--wipe', action='store_true',
+                        help="Confirmer que la base de --database-url est jetable et peut être vidée")
+    parser.add_argument('--teams', type=int, default=120)
+    parser.add_argument('--rounds', type=int, default=4)
+    parser.add_argument('--spectators', type=int, default=100)
+    parser.add_argument('--scorekeepers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20, help="Durée totale en secondes")
+    parser.add_argument('--think-time', type=float, default=1.0,
+                        help="Pause moyenne d'un spectateur entre deux pages (s)")
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--json', action='store_true', help='print one JSON summary line')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        def make_client():
+            return HttpClient(args.url)
+    else:
+        from benchmarks.common import make_app
+
+        app = make_app(teams=args.teams, rounds=args.rounds, finish_last_round=False,
+                       database_url=args.database_url, wipe=args.wipe)
+
+        def make_client():
+            return InProcessClient(app)
+
+    result = run(make_client, args)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print(f"{'endpoint':<26}{'requests':>9}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for endpoint, row in result['endpoints'].items():
+        print(f"{endpoint:<26}{row['requests']:>9}{row['rps']:>8}{row['p50_ms']:>9}"
+              f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['error_rate']:>8.1%}")
+    print(f"Rafale de fin de tour : {result['burst_s']} s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
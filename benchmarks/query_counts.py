@@ -0,0 +1,91 @@
+"""Query-count checks: page views must issue a constant number of statements.
+
+Each scenario is run against a small and a large tournament; the script fails
+(exit code 1) when the statement count grows with the number of teams,
+exceeds the scenario's budget, or when an authenticated request reads the
+``users`` table (the identity comes from the session, see identity.py).
+
+    python -m benchmarks.query_counts
+    python -m benchmarks.query_counts --verbose   # print the statements
+"""
+import argparse
+import sys
+
+from benchmarks.common import QueryCounter, login, make_app
+from extensions import db
+from models.match import Match
+
+SIZES = (30, 300)
+
+
+def _unplayed_match_id():
+    return db.session.query(Match.id).filter(Match.score1.is_(None)).order_by(Match.id).first()[0]
+
+
+def _record_match(client, match_id):
+    return client.post('/matches', data={'record_match': '1', 'match_id': match_id, 'score1': 90, 'score2': 72})
+
+
+def _get(path):
+    return lambda client, prepared: client.get(path)
+
+
+# name -> (budget, authenticated, prepare, request); prepare() runs before counting
+SCENARIOS = {
+    'GET /admin': (5, True, None, _get('/admin')),
+    'GET /matches': (4, False, None, _get('/matches')),
+    'GET /ranking': (5, False, None, _get('/ranking')),
+    'GET /team/1': (4, False, None, _get('/team/1')),
+    'GET /api/v1/standings': (1, False, None, _get('/api/v1/standings')),
+    # + 1 INSERT into the score_events journal
+    'POST /matches record_match': (8, True, _unplayed_match_id, _record_match),
+}
+
+
+def _identity_queries(statements):
+    return [statement for statement in statements if 'FROM users' in statement]
+
+
+def run(teams, verbose=False):
+    """``{scenario: (statement count, identity statement count)}``."""
+    app = make_app(teams=teams, rounds=5, finish_last_round=False)
+    counts = {}
+    for name, (budget, authenticated, prepare, make_request) in SCENARIOS.items():
+        client = app.test_client()
+        if authenticated:
+            login(client)
+        with app.app_context():
+            prepared = prepare() if prepare else None
+            with QueryCounter(db.engine) as counter:
+                response = make_request(client, prepared)
+        assert response.status_code in (200, 302), (name, response.status_code)
+        counts[name] = (counter.count, len(_identity_queries(counter.statements)))
+        if verbose:
+            print(f"--- {name} ({teams} teams)")
+            for statement in counter.statements:
+                print('   ', ' '.join(statement.split())[:150])
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    results = {teams: run(teams, args.verbose) for teams in SIZES}
+
+    failures = 0
+    print(f"{'scenario':<30}" + ''.join(f"{f'{teams} teams':>12}" for teams in SIZES) + f"{'budget':>8}")
+    for name, (budget, _, _, _) in SCENARIOS.items():
+        counts = [results[teams][name][0] for teams in SIZES]
+        identity_queries = sum(results[teams][name][1] for teams in SIZES)
+        ok = len(set(counts)) == 1 and counts[0] <= budget and not identity_queries
+        failures += not ok
+        status = '' if ok else '  FAIL' + (' (identity query)' if identity_queries else '')
+        print(f"{name:<30}" + ''.join(f"{count:>12}" for count in counts) + f"{budget:>8}" + status)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Query plan check: no hot query may fall back to a full table scan.
+
+Seeds a large tournament (SQLite by default, ``--database-url`` for a local
+PostgreSQL), refreshes the planner statistics and explains every hot query
+of query_plans.py. Exit code 1 when a plan scans a whole table. Every
+table of the ``--database-url`` database is dropped first, hence the
+mandatory ``--wipe``.
+
+    python -m benchmarks.query_plans --teams 400 --rounds 12
+    python -m benchmarks.query_plans --database-url postgresql+psycopg://localhost/belote_bench --wipe
+"""
+import argparse
+import sys
+
+from sqlalchemy import text
+
+from benchmarks.common import add_database_arguments, make_app
+from extensions import db
+import query_plans
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=400)
+    parser.add_argument('--rounds', type=int, default=12)
+    add_database_arguments(parser)
+    parser.add_argument('--verbose', action='store_true', help='print every plan')
+    args = parser.parse_args(argv)
+
+    app = make_app(teams=args.teams, rounds=args.rounds, finish_last_round=False,
+                   database_url=args.database_url, wipe=args.wipe)
+    with app.app_context():
+        # Planner statistics, as after a day of use
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+        results = query_plans.check()
+
+    failures = 0
+    for result in results:
+        failures += not result['ok']
+        status = 'ok  ' if result['ok'] else 'FAIL'
+        print(f"{status} {result['query']:<26} {result['statement'][:90]}")
+        if args.verbose or not result['ok']:
+            for line in result['plan']:
+                print(f"        {line}")
+    print(f"{len(results)} requêtes expliquées, {failures} parcours complet(s) de table.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
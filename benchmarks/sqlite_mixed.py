@@ -0,0 +1,120 @@
+"""Mixed read/write load on SQLite: default journal versus the local profile.
+
+Reader threads poll ``/ranking`` and ``/api/v1/standings`` while writer
+threads correct scores through ``update_match_result`` (each write updates a
+match, two teams, the score journal and the tournament revision). An online
+backup is taken halfway through. The run is repeated with ``SQLITE_TUNING``
+off (rollback journal, driver defaults) and on (WAL, synchronous=NORMAL,
+busy timeout); the report gives operations per second, p95 latency and the
+number of "database is locked" errors.
+
+    python -m benchmarks.sqlite_mixed --readers 16 --writers 4 --duration 10
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select
+
+from benchmarks.common import login, make_app
+from extensions import db
+from models.match import Match
+import sqlite_local
+
+
+def run(tuning, args):
+    app = make_app(teams=args.teams, rounds=args.rounds, SQLITE_TUNING=tuning,
+                   SQLITE_BACKUP_DIR=tempfile.mkdtemp(prefix='belote-backup-'),
+                   PROPAGATE_EXCEPTIONS=True)
+    with app.app_context():
+        match_ids = db.session.execute(select(Match.id)).scalars().all()
+        journal = db.session.connection().exec_driver_sql('PRAGMA journal_mode').scalar()
+
+    lock = threading.Lock()
+    samples = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    locked = [0]
+    stop = threading.Event()
+
+    def timed(kind, call):
+        start = time.perf_counter()
+        try:
+            ok = call().status_code in (200, 302, 304)
+        except Exception as error:
+            ok = False
+            if 'database is locked' in str(error):
+                with lock:
+                    locked[0] += 1
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            samples[kind].append(elapsed)
+            errors[kind] += not ok
+
+    def reader():
+        client = app.test_client()
+        while not stop.is_set():
+            timed('read', lambda: client.get('/ranking'))
+            timed('read', lambda: client.get('/api/v1/standings'))
+
+    def writer(seed):
+        rng = random.Random(seed)
+        client = login(app.test_client())
+        while not stop.is_set():
+            match_id = rng.choice(match_ids)
+            data = {'score1': rng.randint(40, 162), 'score2': rng.randint(40, 162)}
+            timed('write', lambda: client.post(f'/update_match_result/{match_id}', data=data))
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.duration / 2)
+    backup_start = time.perf_counter()
+    sqlite_local.backup_database(app, keep=1)
+    backup_ms = (time.perf_counter() - backup_start) * 1000
+    time.sleep(args.duration / 2)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = {'profile': 'local (WAL)' if tuning else 'default', 'journal_mode': journal,
+              'backup_ms': round(backup_ms, 1), 'locked_errors': locked[0]}
+    for kind in ('read', 'write'):
+        values = sorted(samples[kind]) or [0]
+        p95 = statistics.quantiles(values, n=20)[18] if len(values) > 1 else values[0]
+        result[f'{kind}_ops_s'] = round(len(samples[kind]) / args.duration, 1)
+        result[f'{kind}_p95_ms'] = round(p95, 1)
+        result[f'{kind}_errors'] = errors[kind]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=120)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--json', action='store_true', help='print one JSON line per profile')
+    args = parser.parse_args(argv)
+
+    results = [run(False, args), run(True, args)]
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+
+    columns = list(results[0])
+    print(''.join(f'{column:>16}' for column in columns))
+    for result in results:
+        print(''.join(f'{str(result[column]):>16}' for column in columns))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Standings index: rank lookups and score updates versus a full re-sort.
+
+Seeds ``--teams`` teams, then compares, per score entry, re-sorting every team
+(``Tournament.get_ranking``) with the O(log n) update and rank lookup of the
+standings index, and checks that the index still matches a fresh ranking.
+Exit code 1 on mismatch.
+
+    python -m benchmarks.standings --teams 2000 --scores 200
+"""
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.common import make_app
+from extensions import db
+from models.match import Match
+import standings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--scores', type=int, default=200)
+    parser.add_argument('--ranking-system', choices=('points_sum', 'soccer_style'), default='points_sum')
+    args = parser.parse_args(argv)
+
+    app = make_app(teams=args.teams, rounds=args.rounds, finish_last_round=False)
+    rnd = random.Random(0)
+    with app.test_request_context():
+        from app import get_tournament
+
+        tournament = get_tournament()
+        tournament.ranking_system = args.ranking_system
+        db.session.commit()
+
+        start = time.perf_counter()
+        index = standings.get_index(tournament)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matches = Match.query.filter(Match.score1.is_(None)).limit(args.scores).all()
+        lookup_s = sort_s = 0.0
+        for match in matches:
+            team1_id, team2_id = match.team1_id, match.team2_id
+            match.record_score(rnd.randint(0, 200), rnd.randint(0, 200))  # applied to the index after commit
+
+            start = time.perf_counter()
+            index.rank(team1_id)
+            index.neighbours(team2_id)
+            lookup_s += time.perf_counter() - start
+
+            start = time.perf_counter()
+            ranking = tournament.get_ranking()
+            [team.id for team in ranking].index(team1_id)
+            sort_s += time.perf_counter() - start
+
+        current = standings.get_index(tournament)
+        ok = current is index and [row['id'] for row in index.ordered()] == [team.id for team in tournament.get_ranking()]
+
+    count = max(len(matches), 1)
+    print(f"{args.teams} teams, {len(matches)} score entries ({args.ranking_system})")
+    print(f"  index build            {build_ms:8.1f} ms")
+    print(f"  index rank+neighbours  {lookup_s / count * 1000:8.3f} ms per score")
+    print(f"  full re-sort           {sort_s / count * 1000:8.3f} ms per score")
+    print("  index up to date" if ok else "  FAIL: index differs from a fresh ranking")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Startup benchmark: import time, factory time and time to first response.
+
+Each run uses a fresh interpreter so the numbers reflect a real cold start
+(a Heroku dyno restart or a new gunicorn worker without --preload).
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 10 --json >> bench_history.jsonl
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app()
+t2 = time.perf_counter()
+response = app.test_client().get('/ranking')
+t3 = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_response_ms': (t3 - t2) * 1000,
+    'total_ms': (t3 - t0) * 1000,
+}))
+'''
+
+
+def prepare_database(path):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+    subprocess.run(
+        [sys.executable, '-c',
+         'from app import create_app; from bootstrap import bootstrap_database\n'
+         'app = create_app()\n'
+         'with app.app_context(): bootstrap_database()'],
+        cwd=ROOT, env=env, check=True
+    )
+    return env
+
+
+def run_once(env):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print one JSON summary line')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = prepare_database(os.path.join(tmp, 'startup.db'))
+        env.setdefault('SECRET_KEY', 'benchmark')
+        samples = [run_once(env) for _ in range(args.runs)]
+
+    summary = {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in samples[0]
+    }
+    summary['runs'] = args.runs
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for key, value in summary.items():
+            print(f'{key:>20}: {value}')
+
+
+if __name__ == '__main__':
+    main()
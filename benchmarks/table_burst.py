@@ -0,0 +1,137 @@
+"""End-of-round burst: every table captain submits at once.
+
+One thread per table of the current round posts its result at the same
+moment, either to the organizer's form (``--mode direct``: one
+``record_score`` transaction per request) or to the table links
+(``--mode queue``: the writer of table_scores.py, one transaction per batch).
+Reports the time until every result is in, p95 latency, failed requests and
+the number of write transactions (the increase of the tournament revision),
+and fails (exit code 1) unless every table ends up scored.
+
+Without ``--url`` the app runs in-process on a seeded SQLite database and
+both modes are compared; the team totals are checked against the matches as
+well. With ``--url`` one mode drives a running instance, which must hold a
+tournament with an unplayed round and an admin account, e.g.::
+
+    flask bootstrap-db --admin-password secret && flask seed-demo --teams 400 --rounds 3 --unfinished
+    gunicorn --workers 3 --worker-class gthread --threads 8 --bind 127.0.0.1:8000 wsgi:app
+    python -m benchmarks.table_burst --url http://127.0.0.1:8000 --password secret --mode queue
+
+    python -m benchmarks.table_burst --teams 400
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks.loadtest import HttpClient, InProcessClient, login
+
+TABLE_LINK = re.compile(r'href="[^"]*(/table/[^"]+)"')
+MATCH_OPTION = re.compile(r'<option value="(\d+)"')
+
+
+def revision(client):
+    return json.loads(client.get('/api/v1/standings?limit=1')[1])['revision']
+
+
+def unscored_tables(admin):
+    """Table links and match ids of the current round's unplayed matches."""
+    links = TABLE_LINK.findall(admin.get('/admin/tables')[1].decode('utf-8'))
+    match_ids = MATCH_OPTION.findall(admin.get('/matches')[1].decode('utf-8'))
+    return links, match_ids
+
+
+def remaining(admin):
+    """Number of current round tables still without a result."""
+    return admin.get('/admin/tables')[1].decode('utf-8').count('<td>-</td>')
+
+
+def burst(make_client, args, mode):
+    admin = login(make_client(), args.username, args.password)
+    links, match_ids = unscored_tables(admin)
+    if remaining(admin) != len(links) or not links:
+        raise SystemExit("Le tour en cours doit être entièrement sans résultats.")
+
+    rng = random.Random(0)
+    if mode == 'direct':
+        posts = [(login(make_client(), args.username, args.password), '/matches',
+                  {'record_match': '1', 'match_id': match_id,
+                   'score1': rng.randint(0, 162), 'score2': rng.randint(0, 162)})
+                 for match_id in match_ids]
+    else:
+        posts = [(make_client(), link, {'score1': rng.randint(0, 162), 'score2': rng.randint(0, 162)})
+                 for link in links]
+
+    barrier = threading.Barrier(len(posts) + 1)
+    lock = threading.Lock()
+    latencies, failures = [], [0]
+
+    def captain(client, path, data):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            ok = client.post(path, data)[0] == 302
+        except Exception:
+            ok = False
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+            failures[0] += not ok
+
+    threads = [threading.Thread(target=captain, args=post) for post in posts]
+    for thread in threads:
+        thread.start()
+    revision_before = revision(admin)
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    transactions = revision(admin) - revision_before
+    left = remaining(admin)
+    values = sorted(latencies)
+    p95 = statistics.quantiles(values, n=20)[18] if len(values) > 1 else values[0]
+    print(f"{mode:>6}: {len(posts)} tables in {elapsed * 1000:7.0f} ms, p95 {p95:7.0f} ms, "
+          f"{failures[0]} failed, {left} unscored, {transactions} transactions")
+    return failures[0] == 0 and left == 0
+
+
+def run_in_process(args, mode):
+    from benchmarks.common import make_app
+    import aggregates
+
+    app = make_app(teams=args.teams, rounds=args.rounds, finish_last_round=False)
+    ok = burst(lambda: InProcessClient(app), args, mode)
+    with app.app_context():
+        drift = aggregates.check()
+    if drift:
+        print(f"        FAIL: {len(drift)} team total(s) differ from the matches")
+    return ok and not drift
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="Instance à tester (par défaut : application en mémoire)")
+    parser.add_argument('--teams', type=int, default=120)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--mode', choices=('direct', 'queue', 'both'), default='both')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        if args.mode == 'both':
+            parser.error("--url : choisissez --mode direct ou --mode queue (un seul tour à saisir)")
+        ok = burst(lambda: HttpClient(args.url), args, args.mode)
+    else:
+        modes = ('direct', 'queue') if args.mode == 'both' else (args.mode,)
+        ok = all([run_in_process(args, mode) for mode in modes])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
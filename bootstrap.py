@@ -0,0 +1,60 @@
+# bootstrap.py
+"""Provisioning of an empty database in a single step.
+
+``bootstrap_database`` creates the current schema from the models (tables
+and indexes, the same as replaying every migration), the tournament row and
+optionally an admin account, then stamps the Alembic head, all in one
+transaction. Replaces replaying the migrations on a new event, test or
+benchmark database; ``flask db upgrade`` has nothing left to apply
+afterwards. Existing databases keep upgrading through the migrations.
+
+Used by ``flask bootstrap-db``, init_db.py and the benchmarks.
+"""
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import current_app
+from sqlalchemy import inspect, insert
+from werkzeug.security import generate_password_hash
+
+from extensions import db
+from models.tournament import Tournament
+from models.user import User
+
+
+class DatabaseNotEmpty(RuntimeError):
+    """The database already has tables: it is upgraded through the migrations instead."""
+
+
+def _script_directory():
+    migrate = current_app.extensions['migrate']
+    return ScriptDirectory.from_config(migrate.migrate.get_config(migrate.directory))
+
+
+def bootstrap_database(admin_username=None, admin_password=None):
+    """Create schema, tournament and admin account in an empty database; return the stamped revision."""
+    script = _script_directory()
+    head = script.get_current_head()
+
+    with db.engine.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # pysqlite does not open a transaction before DDL by itself
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+        else:
+            connection.begin()
+
+        existing = inspect(connection).get_table_names()
+        if existing:
+            connection.rollback()
+            raise DatabaseNotEmpty(
+                f"La base n'est pas vide ({', '.join(sorted(existing))}) ; utilisez « flask db upgrade »."
+            )
+
+        db.metadata.create_all(connection)
+        connection.execute(insert(Tournament).values(ranking_system='points_sum', prevent_duplicate_matches=False))
+        if admin_username and admin_password:
+            connection.execute(insert(User).values(
+                username=admin_username, password=generate_password_hash(admin_password)
+            ))
+        MigrationContext.configure(connection).stamp(script, head)
+        connection.commit()
+    return head
@@ -0,0 +1,121 @@
+# cache.py
+"""Per-worker cache of derived tournament data, keyed on the tournament revision.
+
+Standings and the scores-by-round matrix only change when a write bumps the
+tournament revision (revision.py), so each worker computes them once per
+revision and serves every HTML page view and API poll in between from memory.
+Values are plain dicts/lists (never ORM instances) so they can be shared
+across requests and sessions.
+"""
+import threading
+
+from flask import current_app
+from sqlalchemy import or_
+
+import standings
+
+from models.match import Match
+from models.query_profiles import with_profile
+
+_lock = threading.Lock()
+
+
+def _entries():
+    return current_app.extensions.setdefault('revision_cache', {})
+
+
+def cached(name, revision, compute):
+    """Return ``compute()`` for ``revision``, computing it at most once per revision.
+
+    Storing a value drops the entries of older revisions, so per-round and
+    per-team entries do not pile up across revisions.
+    """
+    entries = _entries()
+    entry = entries.get(name)
+    if entry is not None and entry[0] == revision:
+        return entry[1]
+
+    value = compute()
+    with _lock:
+        # Entries of older revisions are never served again: keep only the current ones
+        for stale in [key for key, (entry_revision, _) in entries.items() if entry_revision < revision]:
+            del entries[stale]
+        entries[name] = (revision, value)
+    return value
+
+
+def clear():
+    with _lock:
+        _entries().clear()
+
+
+def get_ranking(tournament):
+    """Standings as a list of dicts, in ranking order (from the standings index)."""
+    def compute():
+        rows = []
+        for rank, team in enumerate(standings.get_index(tournament).ordered(), start=1):
+            row = {
+                'rank': rank,
+                'id': team['id'],
+                'name': team['name'],
+                'matches_played': team['matches_played'],
+                'points_for': team['points_for'],
+                'points_against': team['points_against'],
+                'point_difference': team['points_for'] - team['points_against'],
+            }
+            if tournament.ranking_system == 'soccer_style':
+                row['soccer_points'] = team['soccer_points']
+            rows.append(row)
+        return rows
+
+    return cached('ranking', tournament.revision, compute)
+
+
+def get_scores_by_round(tournament):
+    """``(teams_scores, round_numbers)`` as returned by Tournament.get_scores_by_round."""
+    return cached('scores_by_round', tournament.revision, tournament.get_scores_by_round)
+
+
+def get_round_matches(tournament, round_number):
+    """Matches of one round, ordered by table."""
+    def compute():
+        matches = with_profile(Match.query, 'match_with_teams').filter_by(
+            round_number=round_number
+        ).order_by(Match.table_number, Match.id).all()
+        return [{
+            'id': match.id,
+            'table_number': match.table_number,
+            'team1': {'id': match.team1_id, 'name': match.team1.name},
+            'team2': {'id': match.team2_id, 'name': match.team2.name},
+            'score1': match.score1,
+            'score2': match.score2,
+            'date': match.date,
+            'is_closed': bool(match.is_closed),
+        } for match in matches]
+
+    return cached(f'round_matches:{round_number}', tournament.revision, compute)
+
+
+def get_team_matches(tournament, team_id):
+    """Played matches of a team, from the team's point of view."""
+    def compute():
+        matches = with_profile(Match.query, 'match_with_teams').filter(
+            or_(Match.team1_id == team_id, Match.team2_id == team_id),
+            Match.score1.isnot(None)
+        ).order_by(Match.round_number).all()
+
+        team_matches = []
+        for match in matches:
+            is_team1 = match.team1_id == team_id
+            opponent = match.team2 if is_team1 else match.team1
+            team_matches.append({
+                'round_number': match.round_number,
+                'opponent_id': opponent.id,
+                'opponent': opponent.name,
+                'score1': match.score1 if is_team1 else match.score2,
+                'score2': match.score2 if is_team1 else match.score1,
+                'date': match.date
+            })
+        return team_matches
+
+    return cached(f'team_matches:{team_id}', tournament.revision, compute)
@@ -0,0 +1,121 @@
+# commands.py
+import time
+
+import click
+
+
+def register_commands(app):
+    """Register the project's `flask` CLI commands."""
+
+    @app.cli.command('build-assets')
+    def build_assets():
+        """Fingerprint and precompress the static assets into static/dist."""
+        import assets
+
+        manifest = assets.build_assets(app.static_folder)
+        if assets.brotli is None:
+            click.echo("Module brotli absent : seules les variantes gzip ont été générées.")
+        click.echo(f"{len(manifest)} fichiers statiques générés dans static/{assets.DIST_DIR}.")
+
+    @app.cli.command('precompile-templates')
+    def precompile_templates():
+        """Compile every template into the shared bytecode cache."""
+        start = time.perf_counter()
+        names = app.jinja_env.list_templates(extensions=['html'])
+        for name in names:
+            app.jinja_env.get_template(name)
+        elapsed = (time.perf_counter() - start) * 1000
+        click.echo(f"{len(names)} templates compilés en {elapsed:.1f} ms.")
+
+    @app.cli.command('bootstrap-db')
+    @click.option('--admin-username', default='admin', show_default=True)
+    @click.option('--admin-password', envvar='ADMIN_PASSWORD',
+                  help="Mot de passe du compte administrateur (ou ADMIN_PASSWORD) ; sans lui, aucun compte n'est créé.")
+    def bootstrap_db(admin_username, admin_password):
+        """Create the full schema, the tournament and the admin account in an empty database."""
+        from bootstrap import DatabaseNotEmpty, bootstrap_database
+
+        start = time.perf_counter()
+        try:
+            head = bootstrap_database(admin_username, admin_password)
+        except DatabaseNotEmpty as error:
+            raise click.ClickException(str(error))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        click.echo(f"Base créée et marquée à la révision {head} en {elapsed:.0f} ms.")
+        if admin_password:
+            click.echo(f"Compte administrateur « {admin_username} » créé.")
+        else:
+            click.echo("Aucun compte administrateur créé (option --admin-password).")
+
+    @app.cli.command('seed-demo')
+    @click.option('--teams', default=64, show_default=True)
+    @click.option('--rounds', default=5, show_default=True)
+    @click.option('--unfinished', is_flag=True, help="Laisser le dernier tour sans résultats.")
+    def seed_demo(teams, rounds, unfinished):
+        """Fill an empty database with a demo tournament."""
+        from seed import seed_tournament
+
+        seed_tournament(teams=teams, rounds=rounds, finish_last_round=not unfinished)
+        click.echo(f"{teams} équipes et {rounds} tours créés.")
+
+    @app.cli.command('check-aggregates')
+    @click.option('--repair', 'do_repair', is_flag=True,
+                  help="Corriger les totaux des équipes à partir des matchs.")
+    def check_aggregates(do_repair):
+        """Compare team totals with the matches (exit code 1 on drift without --repair)."""
+        import aggregates
+
+        start = time.perf_counter()
+        drift = aggregates.check()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        for item in drift:
+            changes = ', '.join(
+                f"{field} {item['stored'][field]} → {item['computed'][field]}"
+                for field in aggregates.FIELDS if item['stored'][field] != item['computed'][field]
+            )
+            click.echo(f"{item['name']} (#{item['id']}) : {changes}")
+
+        if not drift:
+            click.echo(f"Totaux cohérents avec les matchs (vérifié en {elapsed:.0f} ms).")
+        elif do_repair:
+            click.echo(f"{aggregates.repair()} équipe(s) corrigée(s).")
+        else:
+            click.echo(f"{len(drift)} équipe(s) incohérente(s) ; relancez avec --repair pour corriger.")
+            raise SystemExit(1)
+
+    @app.cli.command('backup-db')
+    @click.option('--every', type=int, default=0,
+                  help="Répéter la sauvegarde toutes les N secondes (Ctrl+C pour arrêter).")
+    def backup_db(every):
+        """Online backup of the local SQLite database into the backups directory."""
+        import sqlite_local
+
+        while True:
+            start = time.perf_counter()
+            path = sqlite_local.backup_database(app)
+            elapsed = (time.perf_counter() - start) * 1000
+            click.echo(f"Sauvegarde écrite dans {path} ({elapsed:.0f} ms).")
+            if every <= 0:
+                return
+            time.sleep(every)
+
+    @app.cli.command('check-query-plans')
+    @click.option('--verbose', is_flag=True, help="Afficher le plan de chaque requête.")
+    def check_query_plans(verbose):
+        """Explain the hot queries on the current database (exit code 1 on a full table scan)."""
+        import query_plans
+
+        results = query_plans.check()
+        for result in results:
+            if verbose or not result['ok']:
+                status = 'ok  ' if result['ok'] else 'FAIL'
+                click.echo(f"{status} {result['query']:<26} {result['statement'][:90]}")
+                for line in result['plan']:
+                    click.echo(f"        {line}")
+
+        failures = [result for result in results if not result['ok']]
+        click.echo(f"{len(results)} requêtes expliquées, {len(failures)} parcours complet(s) de table.")
+        if failures:
+            raise SystemExit(1)
@@ -0,0 +1,129 @@
+# compression.py
+"""gzip/brotli compression of dynamic responses (HTML and JSON).
+
+Responses are compressed in ``after_request`` when the client accepts it,
+the mimetype is textual and the body is at least ``COMPRESS_MIN_SIZE`` bytes.
+Streamed responses are compressed chunk by chunk and flushed after each chunk
+so the client still receives data progressively.
+
+ETags are kept consistent with the encoding: a compressed representation gets
+the ``-gzip``/``-br`` suffix (like Apache's mod_deflate) and the suffix is
+stripped from ``If-None-Match`` before the view sees it, so views can keep
+comparing against their own, encoding-agnostic ETag.
+"""
+import re
+import zlib
+
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+_SUFFIXED_ETAG = re.compile(r'-(?:br|gzip)"')
+
+
+def negotiate_encoding():
+    """Pick the encoding for the current request, or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _gzip_compressor(level):
+    # wbits=31: gzip container
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli_compressor(quality):
+    compressor = brotli.Compressor(quality=quality)
+    return (
+        lambda chunk: compressor.process(chunk) + compressor.flush(),
+        compressor.finish,
+    )
+
+
+def _compressor(encoding):
+    config = current_app.config
+    if encoding == 'br':
+        return _brotli_compressor(config['COMPRESS_BR_LEVEL'])
+    return _gzip_compressor(config['COMPRESS_LEVEL'])
+
+
+def _stream(iterable, compress, finish):
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compress(chunk)
+        yield finish()
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+
+def strip_etag_suffix():
+    """Remove our encoding suffix from If-None-Match before the view runs."""
+    header = request.environ.get('HTTP_IF_NONE_MATCH')
+    if header and _SUFFIXED_ETAG.search(header):
+        request.environ['HTTP_IF_NONE_MATCH'] = _SUFFIXED_ETAG.sub('"', header)
+        g.etag_was_suffixed = True
+
+
+def _suffix_etag(response, encoding):
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + ETAG_SUFFIXES[encoding], weak)
+
+
+def compress_response(response):
+    config = current_app.config
+    if not config['COMPRESS_ENABLED'] or response.mimetype not in config['COMPRESS_MIMETYPES']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.status_code == 304:
+        # Echo the representation ETag the client validated against
+        if g.get('etag_was_suffixed'):
+            _suffix_etag(response, encoding)
+        return response
+
+    if (response.status_code < 200 or response.status_code == 204
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'):
+        return response
+
+    if response.is_streamed:
+        # The compressor is built here: the generator runs outside the app context
+        response.response = _stream(response.response, *_compressor(encoding))
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        compress, finish = _compressor(encoding)
+        response.set_data(compress(data) + finish())
+
+    response.headers['Content-Encoding'] = encoding
+    _suffix_etag(response, encoding)
+    return response
+
+
+def init_app(app):
+    app.before_request(strip_etag_suffix)
+    app.after_request(compress_response)
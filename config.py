@@ -1,4 +1,74 @@
 # config.py
-from flask_sqlalchemy import SQLAlchemy
+import os
 
-db = SQLAlchemy()
+
+def database_url():
+    """Normalise DATABASE_URL (Heroku style) for the psycopg 3 driver."""
+    db_url = os.environ.get("DATABASE_URL")
+    if not db_url:
+        return None
+    return (
+        db_url
+        .replace("postgres://", "postgresql+psycopg://", 1)
+        .replace("postgresql://", "postgresql+psycopg://", 1)
+    )
+
+
+def load_config():
+    """Build the application configuration from environment variables."""
+    config = {
+        'SECRET_KEY': os.environ.get('SECRET_KEY'),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        # Compile every template when the app is created so that gunicorn
+        # --preload shares them between workers instead of compiling per worker.
+        'PRELOAD_TEMPLATES': os.environ.get('PRELOAD_TEMPLATES', 'true').lower() == 'true',
+        # Directory holding the Jinja bytecode cache, shared by all workers
+        # (defaults to <instance>/jinja_cache, filled by `flask precompile-templates`)
+        'TEMPLATE_CACHE_DIR': os.environ.get('TEMPLATE_CACHE_DIR'),
+        # Compression of dynamic HTML/JSON responses (see compression.py)
+        'COMPRESS_ENABLED': os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true',
+        'COMPRESS_MIN_SIZE': int(os.environ.get('COMPRESS_MIN_SIZE', 500)),
+        'COMPRESS_LEVEL': int(os.environ.get('COMPRESS_LEVEL', 6)),
+        'COMPRESS_BR_LEVEL': int(os.environ.get('COMPRESS_BR_LEVEL', 4)),
+        'COMPRESS_MIMETYPES': {'text/html', 'application/json', 'text/plain'},
+        # How long score submission idempotency keys are kept
+        'IDEMPOTENCY_RETENTION_HOURS': int(os.environ.get('IDEMPOTENCY_RETENTION_HOURS', 48)),
+        # Seconds a worker trusts a session's password stamp before re-reading it (see identity.py)
+        'IDENTITY_TTL': int(os.environ.get('IDENTITY_TTL', 60)),
+        # Background jobs of the admin page (see jobs.py)
+        'JOBS_SYNC': os.environ.get('JOBS_SYNC', 'false').lower() == 'true',  # run jobs inside the request
+        'JOBS_WORKERS': int(os.environ.get('JOBS_WORKERS', 1)),  # threads per web process
+        'JOBS_STALE_SECONDS': int(os.environ.get('JOBS_STALE_SECONDS', 3600)),
+        'JOBS_RETENTION_DAYS': int(os.environ.get('JOBS_RETENTION_DAYS', 7)),
+        # Score entry by the table captains (see table_scores.py)
+        'TABLE_SCORES_BATCH': int(os.environ.get('TABLE_SCORES_BATCH', 100)),  # results per transaction
+        'TABLE_SCORES_WINDOW_MS': int(os.environ.get('TABLE_SCORES_WINDOW_MS', 20)),  # wait for more results
+        'TABLE_SCORES_TIMEOUT': int(os.environ.get('TABLE_SCORES_TIMEOUT', 30)),  # seconds a captain waits
+        # Per-request profiling for logged-in users (X-Profile: 1 or ?profile=1, see profiling.py)
+        'PROFILING_ENABLED': os.environ.get('PROFILING_ENABLED', 'true').lower() == 'true',
+        'PROFILER': os.environ.get('PROFILER', 'cprofile'),  # or 'pyinstrument' if installed
+        'PROFILE_DIR': os.environ.get('PROFILE_DIR'),  # defaults to <instance>/profiles
+        'PROFILE_KEEP': int(os.environ.get('PROFILE_KEEP', 50)),
+        # Local SQLite mode, used when DATABASE_URL is not set (see sqlite_local.py)
+        'SQLITE_PATH': os.environ.get('SQLITE_PATH'),  # defaults to <instance>/belote.db
+        'SQLITE_TUNING': os.environ.get('SQLITE_TUNING', 'true').lower() == 'true',
+        'SQLITE_WAL': os.environ.get('SQLITE_WAL', 'true').lower() == 'true',
+        'SQLITE_SYNCHRONOUS': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'SQLITE_BUSY_TIMEOUT_MS': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 10000)),
+        'SQLITE_POOL_SIZE': int(os.environ.get('SQLITE_POOL_SIZE', 10)),
+        'SQLITE_BACKUP_INTERVAL': int(os.environ.get('SQLITE_BACKUP_INTERVAL', 0)),  # seconds, 0 = off
+        'SQLITE_BACKUP_DIR': os.environ.get('SQLITE_BACKUP_DIR'),  # defaults to <instance>/backups
+        'SQLITE_BACKUP_KEEP': int(os.environ.get('SQLITE_BACKUP_KEEP', 10)),
+        # Seconds between two checks of info_panels.json's modification time (see info_panels.py)
+        'INFO_PANELS_CHECK_SECONDS': float(os.environ.get('INFO_PANELS_CHECK_SECONDS', 5)),
+        'INFO_PANELS_PATH': os.environ.get(
+            'INFO_PANELS_PATH',
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'info_panels.json')
+        ),
+    }
+
+    db_url = database_url()
+    if db_url:
+        config['SQLALCHEMY_DATABASE_URI'] = db_url
+
+    return config
@@ -0,0 +1,132 @@
+# display.py
+"""Projector/TV display (``/display``).
+
+A standalone page (no Bootstrap, no navigation) that pages through the
+standings and the current round's tables on a timer. It polls
+``/display/data?since=<revision>``:
+
+- ``204`` when nothing changed (a single query: the tournament lookup);
+- a delta against the revision the screen already has, when that revision is
+  still in the per-worker history of the last ``HISTORY_SIZE`` snapshots;
+- a full snapshot otherwise (first load, worker restart, long disconnection).
+
+Rows are compact arrays whose column order is given by ``STANDINGS_COLUMNS``
+and ``TABLES_COLUMNS``. Ranks are not sent: the screen derives them from the
+``order`` list, so a score only resends the two teams that played.
+"""
+import threading
+from collections import OrderedDict
+
+from flask import Blueprint, current_app, g, jsonify, render_template, request
+
+import cache
+
+bp = Blueprint('display', __name__, url_prefix='/display')
+
+HISTORY_SIZE = 16
+DEFAULT_ROWS = 15
+MAX_ROWS = 100
+DEFAULT_SECONDS = 10
+STANDINGS_COLUMNS = ('id', 'name', 'matches_played', 'points_for', 'point_difference', 'soccer_points')
+TABLES_COLUMNS = ('table_number', 'team1', 'team2', 'score1', 'score2')
+
+_lock = threading.Lock()
+
+
+def _history():
+    return current_app.extensions.setdefault('display_snapshots', OrderedDict())
+
+
+def build_snapshot(tournament):
+    """Standings and current round tables of ``tournament``, as compact rows."""
+    standings = {
+        row['id']: [row['id'], row['name'], row['matches_played'],
+                    row['points_for'], row['point_difference'], row.get('soccer_points')]
+        for row in cache.get_ranking(tournament)
+    }
+    round_number = tournament.get_current_round()
+    tables = {
+        match['table_number']: [match['table_number'], match['team1']['name'], match['team2']['name'],
+                                match['score1'], match['score2']]
+        for match in cache.get_round_matches(tournament, round_number)
+    }
+    return {
+        'revision': tournament.revision,
+        'ranking_system': tournament.ranking_system,
+        'round': round_number,
+        'standings': standings,
+        'tables': tables,
+    }
+
+
+def get_snapshot(tournament):
+    """Snapshot of the current revision, remembered in the per-worker history."""
+    history = _history()
+    snapshot = history.get(tournament.revision)
+    if snapshot is None:
+        snapshot = build_snapshot(tournament)
+        with _lock:
+            history[tournament.revision] = snapshot
+            while len(history) > HISTORY_SIZE:
+                history.popitem(last=False)
+    return snapshot
+
+
+def full_payload(snapshot):
+    return {
+        'full': True,
+        'revision': snapshot['revision'],
+        'ranking_system': snapshot['ranking_system'],
+        'round': snapshot['round'],
+        'order': list(snapshot['standings']),
+        'standings': list(snapshot['standings'].values()),
+        'tables': list(snapshot['tables'].values()),
+    }
+
+
+def delta_payload(old, new):
+    """Rows of ``new`` that differ from ``old``, plus the new ranking order."""
+    if old['round'] != new['round'] or old['ranking_system'] != new['ranking_system']:
+        return full_payload(new)
+
+    changed = [row for team_id, row in new['standings'].items() if old['standings'].get(team_id) != row]
+    removed = [team_id for team_id in old['standings'] if team_id not in new['standings']]
+    order = list(new['standings'])
+    tables = [row for number, row in new['tables'].items() if old['tables'].get(number) != row]
+    return {
+        'full': False,
+        'since': old['revision'],
+        'revision': new['revision'],
+        'round': new['round'],
+        # Ranking order only when it moved (a score usually reorders a few teams)
+        'order': order if order != list(old['standings']) else None,
+        'standings': changed,
+        'removed': removed,
+        'tables': tables,
+    }
+
+
+@bp.route('')
+def index():
+    rows = request.args.get('rows', DEFAULT_ROWS, type=int)
+    seconds = request.args.get('seconds', DEFAULT_SECONDS, type=int)
+    return render_template(
+        'display.html',
+        rows_per_page=max(1, min(rows, MAX_ROWS)),
+        page_seconds=max(1, seconds),
+    )
+
+
+@bp.route('/data')
+def data():
+    tournament = g.tournament
+    since = request.args.get('since', type=int)
+    if since == tournament.revision:
+        return '', 204
+
+    snapshot = get_snapshot(tournament)
+    previous = _history().get(since) if since is not None else None
+    payload = delta_payload(previous, snapshot) if previous else full_payload(snapshot)
+    response = jsonify(payload)
+    response.cache_control.no_store = True
+    return response
@@ -0,0 +1,76 @@
+# idempotency.py
+"""Idempotent score submissions.
+
+Score forms carry a hidden ``idempotency_key`` generated at render time (API
+clients send an ``Idempotency-Key`` header). The key is inserted in the same
+transaction as the score write, so a double tap or a retry after a slow
+response finds the key and gets the original answer back, without touching
+the ``teams`` rows a second time. A key is bound to the endpoint and the
+match it was first used for. Keys older than
+``IDEMPOTENCY_RETENTION_HOURS`` are pruned every ``PRUNE_EVERY`` writes.
+"""
+import itertools
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app, request
+
+from extensions import db
+from models.idempotency import IdempotencyKey
+
+MAX_KEY_LENGTH = 64
+PRUNE_EVERY = 200
+
+_writes = itertools.count(1)
+
+
+def new_key():
+    """Key for a freshly rendered form."""
+    return uuid.uuid4().hex
+
+
+def request_key():
+    """Idempotency key sent with the current request, if any."""
+    key = request.form.get('idempotency_key') or request.headers.get('Idempotency-Key')
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return None
+    return key
+
+
+class KeyReused(Exception):
+    """The key was already used for another form or another match."""
+
+
+def lookup(key, endpoint, match_id):
+    """Previously stored result for ``key``, or None.
+
+    A retry is only answered from the stored row when it was recorded for the
+    same endpoint and match; a key already spent on another submission (back
+    button, restored page) raises KeyReused instead of silently dropping it.
+    """
+    if key is None:
+        return None
+    previous = db.session.get(IdempotencyKey, key)
+    if previous is not None and (previous.endpoint, previous.match_id) != (endpoint, match_id):
+        raise KeyReused(key)
+    return previous
+
+
+def remember(key, endpoint, match_id, location):
+    """Stage ``key`` in the current transaction; committed with the score write."""
+    if key is None:
+        return
+    db.session.add(IdempotencyKey(key=key, endpoint=endpoint, match_id=match_id, location=location))
+    if next(_writes) % PRUNE_EVERY == 0:
+        prune()
+
+
+def prune():
+    """Delete keys older than the retention period (bounded table size)."""
+    hours = current_app.config['IDEMPOTENCY_RETENTION_HOURS']
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    IdempotencyKey.query.filter(IdempotencyKey.created_at < cutoff).delete(synchronize_session=False)
+
+
+def init_app(app):
+    app.add_template_global(new_key, 'idempotency_key')
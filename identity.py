@@ -0,0 +1,106 @@
+# identity.py
+"""Logged-in user identity kept in the signed session.
+
+At login the user's id, username and a stamp derived from the password hash
+are stored in the session cookie; Flask-Login's user loader then builds a
+``SessionUser`` from it instead of reading the ``users`` row on every request.
+
+A password change must still end the existing sessions. Each worker keeps
+the current stamp of each user for ``IDENTITY_TTL`` seconds: a session whose
+stamp no longer matches is logged out, at most ``IDENTITY_TTL`` seconds
+after the change (right away in the process that changed it). With
+``IDENTITY_TTL = 0`` the stamp is read on every request.
+"""
+import hashlib
+import threading
+import time
+
+from flask import current_app, has_app_context, session
+from flask_login import UserMixin, login_user, logout_user
+from sqlalchemy import event, select
+
+from extensions import db
+from models.user import User
+
+SESSION_KEY = 'identity'
+
+_lock = threading.Lock()
+
+
+class SessionUser(UserMixin):
+    """Identity of a logged-in user, rebuilt from the session without a query."""
+
+    def __init__(self, user_id, username):
+        self.id = user_id
+        self.username = username
+
+    def __repr__(self):
+        return f'<SessionUser {self.username}>'
+
+
+def password_stamp(password_hash):
+    """Short fingerprint of a password hash (the hash itself never goes in the cookie)."""
+    return hashlib.sha256(password_hash.encode()).hexdigest()[:16]
+
+
+def _stamps():
+    return current_app.extensions.setdefault('identity_stamps', {})
+
+
+def _remember_stamp(user_id, stamp):
+    with _lock:
+        _stamps()[user_id] = (stamp, time.monotonic())
+
+
+def current_stamp(user_id):
+    """Stamp of the user's current password, re-read every IDENTITY_TTL seconds."""
+    cached = _stamps().get(user_id)
+    if cached is not None and time.monotonic() - cached[1] < current_app.config['IDENTITY_TTL']:
+        return cached[0]
+
+    password_hash = db.session.execute(select(User.password).where(User.id == user_id)).scalar()
+    stamp = password_stamp(password_hash) if password_hash else None
+    _remember_stamp(user_id, stamp)
+    return stamp
+
+
+def login(user, **kwargs):
+    """``login_user`` that also stores the identity in the session."""
+    stamp = password_stamp(user.password)
+    session[SESSION_KEY] = [user.id, user.username, stamp]
+    _remember_stamp(user.id, stamp)
+    return login_user(user, **kwargs)
+
+
+def logout():
+    session.pop(SESSION_KEY, None)
+    return logout_user()
+
+
+def load_user(user_id):
+    identity = session.get(SESSION_KEY)
+    if identity is None or str(identity[0]) != user_id:
+        # Session opened before the identity was cached: one query, then cached
+        user = db.session.get(User, int(user_id))
+        if user is not None:
+            session[SESSION_KEY] = [user.id, user.username, password_stamp(user.password)]
+        return user
+
+    identity_id, username, stamp = identity
+    if current_stamp(identity_id) != stamp:
+        # Password changed (or user deleted) since this session was opened
+        session.pop(SESSION_KEY, None)
+        return None
+    return SessionUser(identity_id, username)
+
+
+def _forget_stamp(target, value, oldvalue, initiator):
+    if target.id is not None and has_app_context():
+        with _lock:
+            _stamps().pop(target.id, None)
+
+
+def init_app(app, login_manager):
+    login_manager.user_loader(load_user)
+    if not event.contains(User.password, 'set', _forget_stamp):
+        event.listen(User.password, 'set', _forget_stamp)
@@ -0,0 +1,105 @@
+# info_panels.py
+"""Help panels of the pages (``info_panels.json``), rendered once per file version.
+
+Every page's panel is rendered to HTML (``templates/_info_panel.html``) when
+the file is loaded and kept in a read-only mapping ``endpoint -> Markup``.
+The context processor hands a template only the panel of the current
+endpoint, so a page render neither walks the JSON structure nor copies it.
+
+The file is loaded when the app is created (before gunicorn forks) and again
+when its modification time changes, checked at most every
+``INFO_PANELS_CHECK_SECONDS`` per worker: an edit shows up without a restart.
+A file that does not parse is logged and the previous panels are kept.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from flask import current_app, request
+from markupsafe import Markup
+
+log = logging.getLogger(__name__)
+
+PANEL_TEMPLATE = '_info_panel.html'
+
+
+class Panels:
+    """Rendered panels of one version of the file."""
+
+    def __init__(self, mtime, pages):
+        self.mtime = mtime
+        self.pages = MappingProxyType(pages)
+
+
+class _State:
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.checked_at = 0.0
+        self.panels = Panels(None, {})
+        self.lock = threading.Lock()
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def render_panels(app, data):
+    """``{endpoint: Markup}`` for the pages of ``data`` (the parsed JSON)."""
+    template = app.jinja_env.get_template(PANEL_TEMPLATE)
+    return {endpoint: Markup(template.render(panel=panel)) for endpoint, panel in data.items()}
+
+
+def load(app, path):
+    """Read and render ``path``; no panels if the file does not exist."""
+    mtime = _mtime(path)
+    if mtime is None:
+        return Panels(None, {})
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return Panels(mtime, render_panels(app, data))
+
+
+def _refresh(app, state):
+    mtime = _mtime(state.path)
+    if mtime == state.panels.mtime:
+        return
+    try:
+        state.panels = load(app, state.path)
+    except (OSError, ValueError):
+        log.exception("Impossible de lire %s, les panneaux précédents sont conservés", state.path)
+        # Do not retry on every check until the file changes again
+        state.panels = Panels(mtime, state.panels.pages)
+
+
+def get_panels(app=None):
+    """Panels of the current version of the file."""
+    app = app or current_app._get_current_object()
+    state = app.extensions['info_panels']
+    now = time.monotonic()
+    if now - state.checked_at >= state.interval:
+        with state.lock:
+            if now - state.checked_at >= state.interval:
+                _refresh(app, state)
+                state.checked_at = now
+    return state.panels
+
+
+def inject_info_panel():
+    """Template variable ``info_panel``: the current page's panel, or None."""
+    return dict(info_panel=get_panels().pages.get(request.endpoint))
+
+
+def init_app(app):
+    state = app.extensions['info_panels'] = _State(app.config['INFO_PANELS_PATH'],
+                                                   app.config['INFO_PANELS_CHECK_SECONDS'])
+    # Read once before the workers fork
+    _refresh(app, state)
+    state.checked_at = time.monotonic()
+    app.context_processor(inject_info_panel)
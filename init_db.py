@@ -1,5 +1,12 @@
-# init_db.py
-from app import app, db
+from app import create_app
+from bootstrap import DatabaseNotEmpty, bootstrap_database
+
+app = create_app()
 
 with app.app_context():
-    db.create_all()
+    # Full schema, tournament row and Alembic stamp in one go (see bootstrap.py)
+    try:
+        bootstrap_database()
+    except DatabaseNotEmpty:
+        # Can run on every deploy: an existing database is left as is
+        print("Base déjà initialisée, rien à faire (mise à jour du schéma : flask db upgrade).")
@@ -0,0 +1,208 @@
+# jobs.py
+"""Background jobs for heavy admin operations.
+
+Generating a round, resetting or archiving the tournament and repairing the
+team totals can take longer than gunicorn's worker timeout on a big
+tournament. The admin page enqueues them instead: a ``jobs`` row is inserted,
+the work runs in a thread pool of the current process and the browser is
+sent to ``/admin/jobs/<id>``, which polls the job's status until it is done.
+
+No broker: the pool lives in the web process (created on first use, i.e.
+after gunicorn has forked the workers), the ``jobs`` table is the shared
+state every worker can read. Status and progress are written on their own
+connection, outside the job's transaction. A job still running after
+``JOBS_STALE_SECONDS`` (its worker was restarted) is reported as failed.
+
+With ``JOBS_SYNC = True`` jobs run inside the request (debugging, scripts).
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import (Blueprint, abort, current_app, flash, jsonify, redirect, render_template,
+                   url_for)
+from flask_login import login_required
+from sqlalchemy import delete, update
+
+from extensions import db
+from models.job import Job
+
+log = logging.getLogger(__name__)
+
+bp = Blueprint('jobs', __name__, url_prefix='/admin/jobs')
+
+_handlers = {}
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+class JobError(Exception):
+    """Expected failure of a job; the message is shown to the admin."""
+
+
+def job(kind):
+    """Register ``function(report, **params)`` as the handler of ``kind``.
+
+    The handler returns the message shown when the job is done and may call
+    ``report(progress, message)`` between its transactions.
+    """
+    def decorator(function):
+        _handlers[kind] = function
+        return function
+    return decorator
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=current_app.config['JOBS_WORKERS'],
+                                           thread_name_prefix='job')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _update(job_id, **values):
+    with db.engine.begin() as connection:
+        connection.execute(update(Job).where(Job.id == job_id).values(**values))
+
+
+def _prune():
+    limit = datetime.utcnow() - timedelta(days=current_app.config['JOBS_RETENTION_DAYS'])
+    db.session.execute(delete(Job).where(Job.status.in_(Job.FINISHED), Job.created_at < limit))
+
+
+def enqueue(kind, result_url, **params):
+    """Record a job and start it; return the ``Job``."""
+    if kind not in _handlers:
+        raise ValueError(f"Tâche inconnue : {kind}")
+
+    _prune()
+    job_row = Job(id=uuid.uuid4().hex, kind=kind, params=params, result_url=result_url)
+    db.session.add(job_row)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    if current_app.config['JOBS_SYNC']:
+        _run(app, job_row.id)
+        db.session.refresh(job_row)
+    else:
+        _get_executor().submit(_run, app, job_row.id)
+    return job_row
+
+
+def _run(app, job_id):
+    with app.app_context():
+        job_row = db.session.get(Job, job_id)
+        kind, params = job_row.kind, dict(job_row.params or {})
+        db.session.rollback()
+        _update(job_id, status=Job.STATUS_RUNNING, started_at=datetime.utcnow())
+
+        def report(progress, message=None):
+            _update(job_id, progress=max(0, min(100, int(progress))), message=message)
+
+        try:
+            message = _handlers[kind](report, **params)
+        except JobError as error:
+            db.session.rollback()
+            _update(job_id, status=Job.STATUS_FAILED, message=str(error), finished_at=datetime.utcnow())
+        except Exception:
+            db.session.rollback()
+            log.exception("Échec de la tâche %s (%s)", kind, job_id)
+            _update(job_id, status=Job.STATUS_FAILED, message="Erreur inattendue, voir les journaux du serveur.",
+                    finished_at=datetime.utcnow())
+        else:
+            _update(job_id, status=Job.STATUS_DONE, progress=100, message=message, finished_at=datetime.utcnow())
+
+
+def get_job(job_id):
+    """The job, marked failed if it has been running for longer than JOBS_STALE_SECONDS."""
+    job_row = db.session.get(Job, job_id)
+    if job_row is None or job_row.finished:
+        return job_row
+
+    stale = datetime.utcnow() - timedelta(seconds=current_app.config['JOBS_STALE_SECONDS'])
+    if (job_row.started_at or job_row.created_at) < stale:
+        job_row.status = Job.STATUS_FAILED
+        job_row.message = "Tâche interrompue (redémarrage du serveur ?)."
+        job_row.finished_at = datetime.utcnow()
+        db.session.commit()
+    return job_row
+
+
+@bp.route('/<job_id>')
+@login_required
+def detail(job_id):
+    job_row = get_job(job_id)
+    if job_row is None:
+        abort(404)
+    if job_row.status == Job.STATUS_DONE:
+        flash(job_row.message, 'success')
+        return redirect(job_row.result_url or url_for('admin'))
+    if job_row.status == Job.STATUS_FAILED:
+        flash(job_row.message, 'error')
+        return redirect(url_for('admin'))
+    return render_template('job.html', job=job_row)
+
+
+@bp.route('/<job_id>/status')
+@login_required
+def status(job_id):
+    job_row = get_job(job_id)
+    if job_row is None:
+        abort(404)
+    response = jsonify(job_row.to_dict())
+    response.cache_control.no_store = True
+    return response
+
+
+# Heavy admin operations
+
+def _tournament():
+    from app import get_tournament
+    return get_tournament()
+
+
+@job('reset_tournament')
+def reset_tournament(report):
+    _tournament().reset_tournament()
+    return "Le tournoi a été réinitialisé."
+
+
+@job('archive_tournament')
+def archive_tournament(report, name):
+    import archive
+
+    archive.archive_tournament(_tournament(), name, progress=report)
+    return f"Le tournoi a été archivé sous le nom « {name} » puis réinitialisé."
+
+
+@job('generate_round')
+def generate_round(report):
+    from models.match import Match
+
+    tournament = _tournament()
+    if not Match.query.first():
+        if not tournament.generate_first_round_matches():
+            raise JobError("Impossible de générer les matchs pour le premier tour.")
+        return "Les matchs du premier tour ont été générés aléatoirement avec succès."
+    if not tournament.generate_next_round():
+        raise JobError("Impossible de générer les matchs pour les tours suivants.")
+    return "Les matchs ont été générés selon le classement avec succès."
+
+
+@job('repair_aggregates')
+def repair_aggregates(report):
+    import aggregates
+
+    drift = aggregates.check()
+    db.session.rollback()
+    if not drift:
+        return "Totaux cohérents avec les matchs."
+    report(50, f"{len(drift)} équipe(s) à corriger")
+    # Recomputed by repair() itself: scores entered since the check are kept
+    return f"{aggregates.repair()} équipe(s) corrigée(s)."
@@ -0,0 +1,42 @@
+# locks.py
+"""Database-level locks serializing critical sections across workers and dynos."""
+import zlib
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from extensions import db
+
+
+def _advisory_key(name):
+    # pg_advisory_xact_lock takes a bigint; crc32 gives a stable key per name
+    return zlib.crc32(name.encode('utf-8'))
+
+
+@contextmanager
+def exclusive_transaction(name):
+    """Run the block in a transaction that holds an exclusive lock.
+
+    - PostgreSQL: transaction-level advisory lock ``name`` (released at commit).
+    - SQLite: ``BEGIN IMMEDIATE``, i.e. the database write lock, taken before
+      the block reads anything.
+
+    Any pending work of the session is committed first so that the lock is the
+    first statement of a fresh transaction. The block is committed on exit and
+    rolled back on error.
+    """
+    session = db.session
+    session.commit()
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': _advisory_key(name)})
+    elif dialect == 'sqlite':
+        session.connection().exec_driver_sql('BEGIN IMMEDIATE')
+
+    try:
+        yield
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
@@ -0,0 +1,40 @@
+"""Ajout de la table score_events
+
+Revision ID: 5b1d8e3f9a27
+Revises: 8f3e5a7c2b19
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1d8e3f9a27'
+down_revision = '8f3e5a7c2b19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'score_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=False),
+        sa.Column('round_number', sa.Integer(), nullable=False),
+        sa.Column('team1_id', sa.Integer(), nullable=False),
+        sa.Column('team2_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('old_score1', sa.Integer(), nullable=True),
+        sa.Column('old_score2', sa.Integer(), nullable=True),
+        sa.Column('score1', sa.Integer(), nullable=False),
+        sa.Column('score2', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_score_events_match_id', 'score_events', ['match_id'])
+
+
+def downgrade():
+    op.drop_index('ix_score_events_match_id', table_name='score_events')
+    op.drop_table('score_events')
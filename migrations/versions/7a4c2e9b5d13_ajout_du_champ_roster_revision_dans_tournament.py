@@ -0,0 +1,26 @@
+"""Ajout du champ roster_revision dans Tournament
+
+Revision ID: 7a4c2e9b5d13
+Revises: 5b1d8e3f9a27
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4c2e9b5d13'
+down_revision = '5b1d8e3f9a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('roster_revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.drop_column('roster_revision')
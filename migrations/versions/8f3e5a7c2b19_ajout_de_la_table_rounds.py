@@ -0,0 +1,46 @@
+"""Ajout de la table rounds
+
+Revision ID: 8f3e5a7c2b19
+Revises: 4e7b2c9d1a06
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3e5a7c2b19'
+down_revision = '4e7b2c9d1a06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rounds',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('number', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('closed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('number', name='uq_rounds_number')
+    )
+
+    # Reprendre les tours déjà joués : un tour est clos quand tous ses matchs le sont
+    op.execute(
+        """
+        INSERT INTO rounds (number, status, created_at, closed_at)
+        SELECT round_number,
+               CASE WHEN MIN(CASE WHEN is_closed THEN 1 ELSE 0 END) = 1 THEN 'closed' ELSE 'open' END,
+               CURRENT_TIMESTAMP,
+               CASE WHEN MIN(CASE WHEN is_closed THEN 1 ELSE 0 END) = 1 THEN CURRENT_TIMESTAMP END
+        FROM matches
+        GROUP BY round_number
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('rounds')
@@ -0,0 +1,58 @@
+"""Ajout des tables d'archives (tournament_archives, player_records)
+
+Revision ID: 9d6f1b4a8c52
+Revises: 7a4c2e9b5d13
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d6f1b4a8c52'
+down_revision = '7a4c2e9b5d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'tournament_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.Column('ranking_system', sa.String(length=50), nullable=False),
+        sa.Column('team_count', sa.Integer(), nullable=False),
+        sa.Column('match_count', sa.Integer(), nullable=False),
+        sa.Column('round_count', sa.Integer(), nullable=False),
+        sa.Column('winner', sa.String(length=80), nullable=True),
+        sa.Column('snapshot', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'player_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('archive_id', sa.Integer(), nullable=False),
+        sa.Column('player_key', sa.String(length=80), nullable=False),
+        sa.Column('player_name', sa.String(length=80), nullable=False),
+        sa.Column('team_name', sa.String(length=80), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('matches_played', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('draws', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('points_for', sa.Integer(), nullable=False),
+        sa.Column('points_against', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['archive_id'], ['tournament_archives.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_player_records_archive_id', 'player_records', ['archive_id'])
+    op.create_index('ix_player_records_player_key', 'player_records', ['player_key'])
+
+
+def downgrade():
+    op.drop_index('ix_player_records_player_key', table_name='player_records')
+    op.drop_index('ix_player_records_archive_id', table_name='player_records')
+    op.drop_table('player_records')
+    op.drop_table('tournament_archives')
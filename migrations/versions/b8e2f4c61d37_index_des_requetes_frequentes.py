@@ -0,0 +1,57 @@
+"""Index des requêtes fréquentes (index partiels et composites sur matches)
+
+Revision ID: b8e2f4c61d37
+Revises: 9d6f1b4a8c52
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2f4c61d37'
+down_revision = '9d6f1b4a8c52'
+branch_labels = None
+depends_on = None
+
+
+def _where(sqlite, postgresql=None):
+    return {'sqlite_where': sa.text(sqlite), 'postgresql_where': sa.text(postgresql or sqlite)}
+
+
+def upgrade():
+    op.create_index('ix_matches_unplayed', 'matches', ['round_number', 'table_number'],
+                    **_where('score1 IS NULL'))
+    op.create_index('ix_matches_played', 'matches', ['round_number'],
+                    **_where('score1 IS NOT NULL'))
+    op.create_index('ix_matches_open_dated', 'matches', ['round_number'],
+                    **_where('is_closed = 0 AND date IS NOT NULL',
+                             'is_closed = false AND date IS NOT NULL'))
+    op.create_index('ix_matches_round_table', 'matches', ['round_number', 'table_number'])
+    op.create_index('ix_matches_team1_round', 'matches', ['team1_id', 'round_number'])
+    op.create_index('ix_matches_team2_round', 'matches', ['team2_id', 'round_number'])
+    op.create_index('ix_matches_pair', 'matches', ['team1_id', 'team2_id'])
+
+    # Covered by the indexes above, or never used by a query
+    op.drop_index('ix_matches_round_number', table_name='matches')
+    op.drop_index('ix_matches_team1_id', table_name='matches')
+    op.drop_index('ix_matches_team2_id', table_name='matches')
+    op.drop_index('ix_matches_score1', table_name='matches')
+    op.drop_index('ix_teams_matches_played', table_name='teams')
+
+
+def downgrade():
+    op.create_index('ix_teams_matches_played', 'teams', ['matches_played'])
+    op.create_index('ix_matches_score1', 'matches', ['score1'])
+    op.create_index('ix_matches_team2_id', 'matches', ['team2_id'])
+    op.create_index('ix_matches_team1_id', 'matches', ['team1_id'])
+    op.create_index('ix_matches_round_number', 'matches', ['round_number'])
+
+    op.drop_index('ix_matches_pair', table_name='matches')
+    op.drop_index('ix_matches_team2_round', table_name='matches')
+    op.drop_index('ix_matches_team1_round', table_name='matches')
+    op.drop_index('ix_matches_round_table', table_name='matches')
+    op.drop_index('ix_matches_open_dated', table_name='matches')
+    op.drop_index('ix_matches_played', table_name='matches')
+    op.drop_index('ix_matches_unplayed', table_name='matches')
@@ -0,0 +1,61 @@
+import json
+import zlib
+from datetime import datetime
+
+from extensions import db
+
+
+class TournamentArchive(db.Model):
+    """Finished tournament, stored as one zlib-compressed JSON snapshot.
+
+    Listing columns (name, date, sizes, winner) are stored beside the
+    snapshot so that the history page never decompresses it.
+    """
+    __tablename__ = 'tournament_archives'
+
+    SNAPSHOT_VERSION = 1
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    ranking_system = db.Column(db.String(50), nullable=False)
+    team_count = db.Column(db.Integer, nullable=False)
+    match_count = db.Column(db.Integer, nullable=False)
+    round_count = db.Column(db.Integer, nullable=False)
+    winner = db.Column(db.String(80), nullable=True)
+    snapshot = db.Column(db.LargeBinary, nullable=False)
+
+    records = db.relationship('PlayerRecord', backref='archive', lazy=True,
+                              cascade='all, delete-orphan')
+
+    @staticmethod
+    def pack(data):
+        return zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), 9)
+
+    @property
+    def data(self):
+        return json.loads(zlib.decompress(self.snapshot))
+
+    def __repr__(self):
+        return f'<TournamentArchive {self.name}>'
+
+
+class PlayerRecord(db.Model):
+    """One player's results in one archived tournament (history index)."""
+    __tablename__ = 'player_records'
+
+    id = db.Column(db.Integer, primary_key=True)
+    archive_id = db.Column(db.Integer, db.ForeignKey('tournament_archives.id'), nullable=False, index=True)
+    player_key = db.Column(db.String(80), nullable=False, index=True)  # search.fold(player_name)
+    player_name = db.Column(db.String(80), nullable=False)
+    team_name = db.Column(db.String(80), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    matches_played = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    draws = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    points_for = db.Column(db.Integer, nullable=False, default=0)
+    points_against = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<PlayerRecord {self.player_name} archive={self.archive_id}>'
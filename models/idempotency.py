@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class IdempotencyKey(db.Model):
+    """Client-supplied key of a score submission, stored with the write itself.
+
+    A retry carrying the same key is answered from this row without touching
+    the match or the teams again.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    key = db.Column(db.String(64), primary_key=True)
+    endpoint = db.Column(db.String(50), nullable=False)
+    match_id = db.Column(db.Integer, nullable=True)
+    location = db.Column(db.String(255), nullable=False)  # Redirect target of the original response
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key} {self.endpoint}>'
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class Job(db.Model):
+    """Heavy admin operation run in the background (see jobs.py)."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_created_at', 'status', 'created_at'),
+    )
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    FINISHED = (STATUS_DONE, STATUS_FAILED)
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(10), nullable=False, default=STATUS_QUEUED)
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0 to 100
+    message = db.Column(db.String(255), nullable=True)  # Current step, then the result shown to the admin
+    result_url = db.Column(db.String(255), nullable=True)  # Where to go once the job is done
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def finished(self):
+        return self.status in self.FINISHED
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'result_url': self.result_url,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f'<Job {self.kind} {self.status}>'
@@ -1,9 +1,30 @@
 from extensions import db
 from datetime import datetime
 from models.team import Team
+from models.score_event import ScoreEvent
 
 class Match(db.Model):
     __tablename__ = 'matches'
+    # Index set of the hot queries (see query_plans.py)
+    __table_args__ = (
+        # Unplayed matches: has_unplayed_matches, get_unplayed_matches
+        db.Index('ix_matches_unplayed', 'round_number', 'table_number',
+                 sqlite_where=db.text('score1 IS NULL'), postgresql_where=db.text('score1 IS NULL')),
+        # Played matches: has_started stops at the first entry even before the first result
+        db.Index('ix_matches_played', 'round_number',
+                 sqlite_where=db.text('score1 IS NOT NULL'), postgresql_where=db.text('score1 IS NOT NULL')),
+        # Entered but not yet closed matches (admin page)
+        db.Index('ix_matches_open_dated', 'round_number',
+                 sqlite_where=db.text('is_closed = 0 AND date IS NOT NULL'),
+                 postgresql_where=db.text('is_closed = false AND date IS NOT NULL')),
+        # Matches of a round, by table
+        db.Index('ix_matches_round_table', 'round_number', 'table_number'),
+        # Matches of a team (team page, scores by round)
+        db.Index('ix_matches_team1_round', 'team1_id', 'round_number'),
+        db.Index('ix_matches_team2_round', 'team2_id', 'round_number'),
+        # Pairs that already met (get_played_pairs): covering index, read instead of the table
+        db.Index('ix_matches_pair', 'team1_id', 'team2_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     team1_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
@@ -15,11 +36,18 @@ class Match(db.Model):
     is_closed = db.Column(db.Boolean, default=False)  # Nouveau champ pour marquer les matchs terminés
     date = db.Column(db.String(20), nullable=True)
     
-    # Relationships for eager loading
-    team1 = db.relationship('Team', foreign_keys=[team1_id], lazy='joined')
-    team2 = db.relationship('Team', foreign_keys=[team2_id], lazy='joined')
+    # Lazy by default: queries that display team names ask for them explicitly
+    # through the 'match_with_teams' profile (models/query_profiles.py)
+    team1 = db.relationship('Team', foreign_keys=[team1_id])
+    team2 = db.relationship('Team', foreign_keys=[team2_id])
 
     def record_score(self, score1, score2):
+        self.apply_score(score1, score2)
+        db.session.commit()
+
+    def apply_score(self, score1, score2):
+        """First result of the match, staged in the session without committing (batched writes)."""
+        old_score1, old_score2 = self.score1, self.score2
         self.score1 = score1
         self.score2 = score2
         self.date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -35,11 +63,15 @@ class Match(db.Model):
         team2.points_for += score2
         team2.points_against += score1
 
-        db.session.commit()
-    
+        db.session.add(ScoreEvent.for_match(self, ScoreEvent.KIND_RECORD, old_score1, old_score2))
+
     def update_score(self, score1, score2):
-        old_score1 = self.score1 
-        old_score2 = self.score2 
+        # Un match sans résultat se corrige comme une première saisie
+        if self.score1 is None or self.score2 is None:
+            return self.record_score(score1, score2)
+
+        old_score1 = self.score1
+        old_score2 = self.score2
 
         team1 = db.session.get(Team, self.team1_id)
         team2 = db.session.get(Team, self.team2_id)
@@ -52,4 +84,5 @@ class Match(db.Model):
         self.score1 = score1
         self.score2 = score2
 
+        db.session.add(ScoreEvent.for_match(self, ScoreEvent.KIND_UPDATE, old_score1, old_score2))
         db.session.commit()
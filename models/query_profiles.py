@@ -0,0 +1,34 @@
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from models.team import Team, Player
+from models.match import Match
+
+# Each route or service call declares what it is going to read; relationships
+# are lazy by default so that existence checks and id-only queries never pay
+# for joins they do not use.
+PROFILES = {
+    # Match lists that display both team names (matches page, admin)
+    'match_with_teams': (
+        joinedload(Match.team1),
+        joinedload(Match.team2),
+    ),
+    # Match columns needed to build score tables, without the teams
+    'match_scores': (
+        load_only(Match.team1_id, Match.team2_id, Match.score1, Match.score2, Match.round_number),
+    ),
+    # Admin team table: names and players in two statements whatever the team count
+    'team_with_players': (
+        selectinload(Team.players).load_only(Player.name),
+    ),
+    # Ranking: only the aggregate columns
+    'team_ranking': (
+        load_only(Team.name, Team.matches_played, Team.points_for, Team.points_against),
+    ),
+}
+
+
+def with_profile(query, profile):
+    """Apply the loader options of ``profile`` (None leaves the query untouched)."""
+    if profile is None:
+        return query
+    return query.options(*PROFILES[profile])
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class Round(db.Model):
+    """One round of the tournament; the latest row is the current round."""
+    __tablename__ = 'rounds'
+    __table_args__ = (db.UniqueConstraint('number', name='uq_rounds_number'),)
+
+    STATUS_OPEN = 'open'
+    STATUS_CLOSED = 'closed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    number = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default=STATUS_OPEN)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    closed_at = db.Column(db.DateTime, nullable=True)
+
+    @classmethod
+    def current(cls):
+        """Latest round (uses the unique index on number), or None before the first round."""
+        return cls.query.order_by(cls.number.desc()).first()
+
+    def close(self):
+        self.status = self.STATUS_CLOSED
+        self.closed_at = datetime.utcnow()
+
+    def __repr__(self):
+        return f'<Round {self.number} {self.status}>'
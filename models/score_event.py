@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from extensions import db
+
+
+class ScoreEvent(db.Model):
+    """Append-only journal of score changes.
+
+    One row per ``record_score``/``update_score`` call, written in the same
+    transaction as the match. ``match_id`` is deliberately not a foreign key:
+    the journal outlives the matches deleted by a tournament reset.
+    """
+    __tablename__ = 'score_events'
+
+    KIND_RECORD = 'record'
+    KIND_UPDATE = 'update'
+
+    id = db.Column(db.Integer, primary_key=True)
+    match_id = db.Column(db.Integer, nullable=False, index=True)
+    round_number = db.Column(db.Integer, nullable=False)
+    team1_id = db.Column(db.Integer, nullable=False)
+    team2_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(10), nullable=False)
+    old_score1 = db.Column(db.Integer, nullable=True)
+    old_score2 = db.Column(db.Integer, nullable=True)
+    score1 = db.Column(db.Integer, nullable=False)
+    score2 = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    @classmethod
+    def for_match(cls, match, kind, old_score1, old_score2):
+        return cls(
+            match_id=match.id,
+            round_number=match.round_number,
+            team1_id=match.team1_id,
+            team2_id=match.team2_id,
+            kind=kind,
+            old_score1=old_score1,
+            old_score2=old_score2,
+            score1=match.score1,
+            score2=match.score2,
+        )
+
+    def __repr__(self):
+        return f'<ScoreEvent {self.kind} match={self.match_id} {self.score1}-{self.score2}>'
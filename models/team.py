@@ -3,6 +3,10 @@ from extensions import db
 
 class Team(db.Model):
     __tablename__ = 'teams'
+    __table_args__ = (
+        db.Index('ix_teams_name', 'name'),
+        db.Index('ix_teams_points_for', 'points_for'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
@@ -38,4 +42,4 @@ class Player(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), nullable=False)
-    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=False, index=True)
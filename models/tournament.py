@@ -1,9 +1,13 @@
 import json
 import os
-from sqlalchemy import func, or_
+from sqlalchemy import delete, exists, or_, update
 from extensions import db
 from models.team import Team
 from models.match import Match
+from models.round import Round
+from models.query_profiles import with_profile
+from locks import exclusive_transaction
+from standings import sort_key
 from datetime import datetime
 
 import random
@@ -12,10 +16,14 @@ class Tournament(db.Model):
     __tablename__ = 'tournaments'
     
     id = db.Column(db.Integer, primary_key=True)
-    ranking_system = db.Column(db.String(50), default='points_sum')  # 'points_sum' or 'soccer_style'
-    prevent_duplicate_matches = db.Column(db.Boolean, default=False)
-    
-    current_round = 0
+    ranking_system = db.Column(db.String(20), nullable=False, default='points_sum',
+                               server_default='points_sum')  # 'points_sum' or 'soccer_style'
+    prevent_duplicate_matches = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    # Incremented on every commit that changes teams, players, matches or settings
+    # (see revision.py); used for ETags and per-worker caches.
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Incremented only when teams or players are added, removed or renamed (search index)
+    roster_revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     def add_team(self, name):
         if self.has_started():
@@ -30,68 +38,66 @@ class Tournament(db.Model):
         return True
 
     def has_started(self):
-        return Match.query.filter(Match.score1.isnot(None)).first() is not None
+        return db.session.query(exists().where(Match.score1.isnot(None))).scalar()
 
-    def get_teams(self):
+    def get_teams(self, profile=None):
         """Récupère toutes les équipes triées par nom."""
-        return Team.query.order_by(Team.name).all()
+        return with_profile(Team.query, profile).order_by(Team.name).all()
+
+    def get_matches(self, profile=None):
+        return with_profile(Match.query, profile).all()
 
-    def get_matches(self):
-        return Match.query.all()
+    def get_unplayed_matches(self, profile='match_with_teams'):
+        return with_profile(Match.query, profile).filter(Match.score1.is_(None)).all()
 
-    def get_unplayed_matches(self):
-        return Match.query.filter(Match.score1.is_(None)).all()
+    def get_played_matches(self, profile='match_with_teams'):
+        return with_profile(Match.query, profile).filter(Match.score1.isnot(None)).all()
 
-    def get_played_matches(self):
-        return Match.query.filter(Match.score1.isnot(None)).all()
+    def get_open_dated_matches(self, profile='match_with_teams'):
+        """Matches with a result that are not closed yet (ix_matches_open_dated)."""
+        return with_profile(Match.query, profile).filter(
+            Match.is_closed == False,  # noqa: E712 (must match the partial index predicate)
+            Match.date.isnot(None)
+        ).all()
     
 
     def get_current_round(self):
-        min_matches = db.session.query(func.min(Team.matches_played)).scalar()
-        return (min_matches if min_matches is not None else 0) + 1
+        current = Round.current()
+        return current.number if current else 1
 
     def get_ranking(self):
         """Get teams ranked by the configured ranking system"""
-        teams = Team.query.all()
+        teams = with_profile(Team.query, 'team_ranking').all()
         
         if self.ranking_system == 'soccer_style':
-            # Calculate soccer points for each team
+            # Calculate soccer points for all teams with a single query
+            soccer_points = self._calculate_all_soccer_points()
             for team in teams:
-                team.soccer_points = self._calculate_soccer_points(team)
+                team.soccer_points = soccer_points.get(team.id, 0)
                 team.point_difference = team.points_for - team.points_against
             
             # Sort by soccer points, then point difference, then points for
-            teams.sort(key=lambda t: (-t.soccer_points, -t.point_difference, -t.points_for))
+            teams.sort(key=lambda t: (*sort_key(self.ranking_system, t.points_for, t.points_against, t.soccer_points), t.id))
         else:
             # Default: sort by points_for (sum of points)
-            teams.sort(key=lambda t: (-t.points_for, -(t.points_for - t.points_against), t.points_against))
+            teams.sort(key=lambda t: (*sort_key(self.ranking_system, t.points_for, t.points_against), t.id))
         
         return teams
     
-    def _calculate_soccer_points(self, team):
-        """Calculate soccer-style points: 3 for win, 1 for draw, 0 for loss"""
-        points = 0
-        
-        # Get all completed matches for this team
-        matches = Match.query.filter(
-            ((Match.team1_id == team.id) | (Match.team2_id == team.id)) &
-            (Match.score1.isnot(None))
-        ).all()
-        
-        for match in matches:
-            if match.team1_id == team.id:
-                team_score = match.score1
-                opponent_score = match.score2
+    def _calculate_all_soccer_points(self):
+        """Soccer-style points of every team, as a {team_id: points} dict"""
+        points = {}
+        played = db.session.query(Match.team1_id, Match.team2_id, Match.score1, Match.score2).filter(
+            Match.score1.isnot(None)
+        )
+        for team1_id, team2_id, score1, score2 in played:
+            if score1 > score2:
+                points[team1_id] = points.get(team1_id, 0) + 3  # Win
+            elif score1 < score2:
+                points[team2_id] = points.get(team2_id, 0) + 3
             else:
-                team_score = match.score2
-                opponent_score = match.score1
-            
-            if team_score > opponent_score:
-                points += 3  # Win
-            elif team_score == opponent_score:
-                points += 1  # Draw
-            # Loss = 0 points
-        
+                points[team1_id] = points.get(team1_id, 0) + 1  # Draw
+                points[team2_id] = points.get(team2_id, 0) + 1
         return points
 
     def remove_team(self, team_name):
@@ -101,10 +107,10 @@ class Tournament(db.Model):
             return False  # Équipe non trouvée
 
         # Vérifier si l'équipe a déjà joué des matchs
-        if Match.query.filter(
+        if db.session.query(exists().where(
             ((Match.team1_id == team.id) | (Match.team2_id == team.id)) &
             (Match.is_closed == True)
-        ).first():
+        )).scalar():
             return False  # L'équipe a déjà joué des matchs
 
         # Supprimer explicitement les joueurs de l'équipe
@@ -116,62 +122,76 @@ class Tournament(db.Model):
         db.session.commit()
         return True
 
-    def reset_tournament(self):
-        teams = Team.query.all()
-        for team in teams:
-            team.matches_played = 0
-            team.points_for = 0
-            team.points_against = 0
+    def clear_results(self):
+        """Set-based reset of the live tables (the caller commits)."""
+        db.session.execute(update(Team).values(matches_played=0, points_for=0, points_against=0))
 
-        # Supprimer tous les matchs
-        Match.query.delete()
+        # Supprimer tous les matchs et les tours
+        db.session.execute(delete(Match))
+        db.session.execute(delete(Round))
 
-        db.session.commit()
+    def reset_tournament(self):
+        # Même verrou que la génération des tours : pas de tour créé pendant la remise à zéro
+        with exclusive_transaction('round_transition'):
+            self.clear_results()
         return True
 
     def has_unplayed_matches(self):
-        return Match.query.filter(Match.score1.is_(None)).first() is not None
+        return db.session.query(exists().where(Match.score1.is_(None))).scalar()
+
+    def get_played_pairs(self):
+        """All pairs of teams that already met, as a set of frozensets"""
+        return {
+            frozenset(pair)
+            for pair in db.session.query(Match.team1_id, Match.team2_id)
+        }
+
+    def _open_next_round(self):
+        """Close the current round and its matches, open the next one; return its number"""
+        current = Round.current()
+        if current and current.status == Round.STATUS_OPEN:
+            current.close()
+        Match.query.filter(Match.is_closed.isnot(True)).update({'is_closed': True})
+
+        next_round = Round(number=(current.number if current else 0) + 1)
+        db.session.add(next_round)
+        return next_round.number
 
-    def have_teams_played(self, team1_id, team2_id):
-        """Check if two teams have already played against each other"""
-        return Match.query.filter(
-            ((Match.team1_id == team1_id) & (Match.team2_id == team2_id)) |
-            ((Match.team1_id == team2_id) & (Match.team2_id == team1_id))
-        ).first() is not None
+    def _create_matches(self, round_number, pairs):
+        for table_number, (team1_id, team2_id) in enumerate(pairs, start=1):
+            match = Match(team1_id=team1_id, team2_id=team2_id, table_number=table_number, round_number=round_number)
+            db.session.add(match)
 
     def generate_next_round(self):
-        if self.has_unplayed_matches():
-            return False  # Il reste des matchs non joués
-        Match.query.filter(Match.is_closed.isnot(True)).update({'is_closed': True})
+        # Verrou : deux administrateurs ne peuvent pas générer le même tour en parallèle
+        with exclusive_transaction('round_transition'):
+            if self.has_unplayed_matches():
+                return False  # Il reste des matchs non joués
 
-        teams = self.get_ranking()
+            teams = self.get_ranking()
 
-        if len(teams) < 2:
-            return False
+            if len(teams) < 2:
+                return False
 
-        if len(teams) % 2 != 0:
-            return False
+            if len(teams) % 2 != 0:
+                return False
 
-        # If prevent_duplicate_matches is enabled, use smart pairing
-        if self.prevent_duplicate_matches:
-            return self._generate_round_no_duplicates(teams)
-        
-        # Default: Générer les matchs pour le prochain tour : 1er vs 2ème, 3ème vs 4ème, etc.
-        table_number = 0
-        for i in range(0, len(teams), 2):
-            table_number += 1
-            if i + 1 < len(teams):
-                match = Match(team1_id=teams[i].id, team2_id=teams[i + 1].id, table_number = table_number,round_number=self.get_current_round())
-                db.session.add(match)
+            # If prevent_duplicate_matches is enabled, use smart pairing
+            if self.prevent_duplicate_matches:
+                pairs = self._pair_teams_no_duplicates(teams)
+            else:
+                # Default: Générer les matchs pour le prochain tour : 1er vs 2ème, 3ème vs 4ème, etc.
+                pairs = [(teams[i].id, teams[i + 1].id) for i in range(0, len(teams), 2)]
 
-        db.session.commit()
+            self._create_matches(self._open_next_round(), pairs)
         return True
     
-    def _generate_round_no_duplicates(self, teams):
-        """Generate matches ensuring no team plays the same opponent twice"""
+    def _pair_teams_no_duplicates(self, teams):
+        """Pair teams ensuring no team plays the same opponent twice"""
         available = list(teams)
-        matches_to_create = []
-        table_number = 0
+        pairs = []
+        # One query for the whole round instead of one per candidate pair
+        played_pairs = self.get_played_pairs()
         
         while len(available) >= 2:
             team1 = available.pop(0)
@@ -179,51 +199,34 @@ class Tournament(db.Model):
             
             # Try to find an opponent that team1 hasn't played yet
             for i, team2 in enumerate(available):
-                if not self.have_teams_played(team1.id, team2.id):
-                    table_number += 1
-                    matches_to_create.append((team1.id, team2.id, table_number))
+                if frozenset((team1.id, team2.id)) not in played_pairs:
+                    pairs.append((team1.id, team2.id))
                     available.pop(i)
                     paired = True
                     break
             
             # If no valid opponent found, pair with the first available (duplicate match)
             if not paired and available:
-                table_number += 1
                 team2 = available.pop(0)
-                matches_to_create.append((team1.id, team2.id, table_number))
-        
-        # Create all matches
-        current_round = self.get_current_round()
-        for team1_id, team2_id, table_num in matches_to_create:
-            match = Match(team1_id=team1_id, team2_id=team2_id, table_number=table_num, round_number=current_round)
-            db.session.add(match)
+                pairs.append((team1.id, team2.id))
         
-        db.session.commit()
-        return True
+        return pairs
 
     def generate_first_round_matches(self):
-        Match.query.filter_by(is_closed=False).update({'is_closed': True})
-        db.session.commit()
+        with exclusive_transaction('round_transition'):
+            if Round.current() is not None:
+                return False  # Le premier tour a déjà été généré
 
-        teams = self.get_teams()
-        if len(teams) % 2 != 0:
-            return False  # Le nombre d'équipes doit être pair
+            teams = self.get_teams()
+            if len(teams) % 2 != 0:
+                return False  # Le nombre d'équipes doit être pair
 
-        # Mélangez les équipes de manière aléatoire
-        random.shuffle(teams)
-        table_number = 0
+            # Mélangez les équipes de manière aléatoire
+            random.shuffle(teams)
 
-        # Créez des matchs en appariant les équipes aléatoirement
-        for i in range(0, len(teams), 2):
-            table_number += 1
-            team1 = teams[i]
-            team2 = teams[i + 1]
-
-            match = Match(team1_id=team1.id, team2_id=team2.id, table_number = table_number, round_number=self.get_current_round())
-            
-            db.session.add(match)
-
-        db.session.commit()
+            # Créez des matchs en appariant les équipes aléatoirement
+            pairs = [(teams[i].id, teams[i + 1].id) for i in range(0, len(teams), 2)]
+            self._create_matches(self._open_next_round(), pairs)
         return True
 
     def get_scores_by_round(self):
@@ -232,14 +235,14 @@ class Tournament(db.Model):
         round_numbers = [round[0] for round in rounds if round[0] is not None]
 
         # Récupérer toutes les équipes triées par points (classement)
-        teams = Team.query.order_by(
+        teams = with_profile(Team.query, 'team_ranking').order_by(
             Team.points_for.desc(),
             (Team.points_for - Team.points_against).desc(),
             Team.points_against.asc()
         ).all()
         
         # Batch-fetch all matches at once instead of querying per-team-per-round
-        all_matches = Match.query.all()
+        all_matches = self.get_matches(profile='match_scores')
         
         # Build a lookup dict: (team_id, round_number) -> match
         match_map = {}
@@ -0,0 +1,224 @@
+# profiling.py
+"""Opt-in profiling of single requests, for logged-in administrators.
+
+Send ``X-Profile: 1`` or add ``?profile=1`` to a URL while logged in: the
+request runs under ``cProfile`` (or pyinstrument's sampling profiler when
+``PROFILER=pyinstrument`` and the package is installed) and the SQL time is
+measured through engine events. The result is saved in ``PROFILE_DIR`` with
+its metadata (endpoint, team count, tournament revision, code revision); only
+the ``PROFILE_KEEP`` most recent profiles are kept. Saved profiles are listed
+under ``/admin/profiles``.
+"""
+import cProfile
+import json
+import os
+import pstats
+import re
+import time
+from datetime import datetime
+
+from flask import (Blueprint, abort, current_app, g, has_app_context, render_template,
+                   request, send_from_directory)
+from flask_login import current_user, login_required
+from sqlalchemy import event, func, select
+
+from extensions import db
+
+try:
+    import pyinstrument
+except ImportError:  # optional dependency
+    pyinstrument = None
+
+bp = Blueprint('profiling', __name__, url_prefix='/admin/profiles')
+
+TOP_FUNCTIONS = 40
+
+
+def profile_dir():
+    return current_app.config['PROFILE_DIR'] or os.path.join(current_app.instance_path, 'profiles')
+
+
+def _requested():
+    return request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('profile_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    sql = g.get('profile_sql') if has_app_context() else None
+    if sql is not None:
+        sql['time'] += elapsed
+        sql['count'] += 1
+
+
+def _listen_engine():
+    engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def start_profile():
+    if not current_app.config['PROFILING_ENABLED'] or not _requested():
+        return
+    if not current_user.is_authenticated:
+        return
+
+    _listen_engine()
+    if current_app.config['PROFILER'] == 'pyinstrument' and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    g.profiler = profiler
+    g.profile_sql = {'time': 0.0, 'count': 0}
+    g.profile_start = time.perf_counter()
+
+
+def _stop(profiler):
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def finish_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    _stop(profiler)
+    duration = time.perf_counter() - g.profile_start
+    sql = g.pop('profile_sql')
+
+    profile_id = save_profile(profiler, {
+        'endpoint': request.endpoint,
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+        'sql_ms': round(sql['time'] * 1000, 2),
+        'sql_count': sql['count'],
+    })
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+def _abort_profile(exc):
+    # Une exception dans la vue saute after_request : arrêter quand même le profileur
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        _stop(profiler)
+
+
+def save_profile(profiler, meta):
+    """Write the profile and its metadata; keep only the most recent PROFILE_KEEP."""
+    from models.team import Team
+
+    tournament = g.get('tournament')
+    meta.update({
+        'created_at': datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        'teams': db.session.scalar(select(func.count()).select_from(Team)),
+        'revision': tournament.revision if tournament else None,
+        # SOURCE_VERSION is set by the Heroku build, GIT_REV can be set elsewhere
+        'code_revision': os.environ.get('SOURCE_VERSION') or os.environ.get('GIT_REV'),
+        'profiler': 'cprofile' if isinstance(profiler, cProfile.Profile) else 'pyinstrument',
+    })
+
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{datetime.now():%Y%m%d-%H%M%S-%f}"  # sorts chronologically (rotation)
+    meta['id'] = profile_id
+
+    if meta['profiler'] == 'cprofile':
+        profiler.dump_stats(os.path.join(directory, f'{profile_id}.prof'))
+    else:
+        with open(os.path.join(directory, f'{profile_id}.html'), 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    _rotate(directory, current_app.config['PROFILE_KEEP'])
+    return profile_id
+
+
+def _rotate(directory, keep):
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for profile_id in ids[:-keep] if keep > 0 else ids:
+        for extension in ('.json', '.prof', '.html'):
+            path = os.path.join(directory, profile_id + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_profiles():
+    """Metadata of the saved profiles, most recent first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                profiles.append(json.load(f))
+    return profiles
+
+
+def load_profile(profile_id):
+    path = os.path.join(profile_dir(), f'{profile_id}.json')
+    if not re.fullmatch(r'[\w-]+', profile_id) or not os.path.exists(path):
+        abort(404)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def top_functions(profile_id, limit=TOP_FUNCTIONS):
+    """Functions of a cProfile dump sorted by cumulative time."""
+    stats = pstats.Stats(os.path.join(profile_dir(), f'{profile_id}.prof'))
+    rows = []
+    for (filename, line, name), (primitive, calls, total, cumulative, callers) in stats.stats.items():
+        rows.append({
+            'function': name,
+            'location': f'{os.path.basename(filename)}:{line}' if line else filename,
+            'calls': calls,
+            'total_ms': round(total * 1000, 2),
+            'cumulative_ms': round(cumulative * 1000, 2),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+@bp.route('/')
+@login_required
+def index():
+    return render_template('profiles.html', profiles=list_profiles())
+
+
+@bp.route('/<profile_id>')
+@login_required
+def detail(profile_id):
+    meta = load_profile(profile_id)
+    functions = top_functions(profile_id) if meta['profiler'] == 'cprofile' else []
+    return render_template('profile_detail.html', profile=meta, functions=functions)
+
+
+@bp.route('/<profile_id>/raw')
+@login_required
+def raw(profile_id):
+    meta = load_profile(profile_id)
+    extension = '.prof' if meta['profiler'] == 'cprofile' else '.html'
+    return send_from_directory(profile_dir(), profile_id + extension,
+                               as_attachment=extension == '.prof')
+
+
+def init_app(app):
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
+    app.teardown_request(_abort_profile)
+    app.register_blueprint(bp)
@@ -0,0 +1,138 @@
+# query_plans.py
+"""Query plan regression check of the hot queries.
+
+Each entry of ``HOT_QUERIES`` runs the real code path (model methods, cache
+builders) while the SQL statements are recorded, then every recorded
+statement is explained with its parameters:
+
+- SQLite: ``EXPLAIN QUERY PLAN``, every ``SCAN`` of a table or of a whole
+  index is reported;
+- PostgreSQL: ``EXPLAIN (FORMAT JSON)`` with ``enable_seqscan = off``, so a
+  ``Seq Scan`` only remains when no index can serve the query.
+
+A full scan is a failure unless the table or index is listed as allowed for
+that query (the admin team table reads every team; a partial index only
+holds the rows the query wants). Used by
+``flask check-query-plans`` and ``python -m benchmarks.query_plans``.
+"""
+import json
+
+from sqlalchemy import event, select
+
+import cache
+import idempotency
+from extensions import db
+from models.match import Match
+from models.round import Round
+
+
+def _any_match(predicate):
+    return db.session.execute(select(Match).where(predicate).limit(1)).scalar()
+
+
+def _two_teams():
+    match = _any_match(Match.score1.isnot(None)) or _any_match(Match.id.isnot(None))
+    return (match.team1_id, match.team2_id) if match else (1, 2)
+
+
+# name -> (code path taking the tournament and two team ids,
+#          tables that may be read end to end, or indexes that may be walked whole)
+HOT_QUERIES = {
+    # Partial indexes: scanning them only reads the matching rows
+    'has_unplayed_matches': (lambda t, teams: t.has_unplayed_matches(), ('ix_matches_unplayed',)),
+    # Once most matches are played SQLite prefers a scan that stops at the first row;
+    # before the first result (every row would be skipped) it uses ix_matches_played
+    'has_started': (lambda t, teams: t.has_started(), ('matches', 'ix_matches_played')),
+    'get_unplayed_matches': (lambda t, teams: t.get_unplayed_matches(), ('ix_matches_unplayed',)),
+    'get_open_dated_matches': (lambda t, teams: t.get_open_dated_matches(), ('ix_matches_open_dated',)),
+    # Pairing reads every pair that already met, once per round: a full walk of the
+    # covering index (two ids per entry) instead of the table rows is expected
+    'get_played_pairs': (lambda t, teams: t.get_played_pairs(), ('ix_matches_pair',)),
+    # ORDER BY number DESC LIMIT 1: one row per round, read backwards on the unique index
+    'current_round': (lambda t, teams: Round.current(), ('rounds',)),
+    'round_matches': (lambda t, teams: cache.get_round_matches(t, t.get_current_round()), ('rounds',)),
+    'team_matches': (lambda t, teams: cache.get_team_matches(t, teams[0]), ()),
+    # The admin table lists every team and every player
+    'admin_teams_with_players': (lambda t, teams: t.get_teams(profile='team_with_players'),
+                                 ('teams', 'players')),
+    'idempotency_lookup': (lambda t, teams: idempotency.lookup('0' * 32, 'record_match', None), ()),
+}
+
+
+class _Recorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+def _sqlite_full_scans(connection, statement, parameters):
+    """``(table, index or None)`` of every table or whole index scanned."""
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    plan = [row[-1] for row in rows]
+    scans = []
+    for detail in plan:
+        words = detail.split()
+        if words[:1] != ['SCAN'] or words[1:3] == ['CONSTANT', 'ROW']:
+            continue
+        # "SCAN t USING [COVERING] INDEX ix": the whole index is walked
+        scans.append((words[1], words[words.index('INDEX') + 1] if 'INDEX' in words else None))
+    return scans, plan
+
+
+def _postgres_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _postgres_nodes(child)
+
+
+def _postgres_full_scans(connection, statement, parameters):
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    raw = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+    plan = (raw if isinstance(raw, list) else json.loads(raw))[0]['Plan']
+    nodes = list(_postgres_nodes(plan))
+    scans = [(node['Relation Name'], None) for node in nodes if node['Node Type'] == 'Seq Scan']
+    return scans, [f"{node['Node Type']} {node.get('Relation Name', '')}".strip() for node in nodes]
+
+
+def check():
+    """Explain every hot query; return a list of result dicts (``ok`` False on full scans)."""
+    engine = db.engine
+    explain = {'sqlite': _sqlite_full_scans, 'postgresql': _postgres_full_scans}.get(engine.dialect.name)
+    if explain is None:
+        raise RuntimeError(f"Dialecte non pris en charge : {engine.dialect.name}")
+
+    from app import get_tournament
+
+    tournament = get_tournament()
+    teams = _two_teams()
+    results = []
+    for name, (run, allowed) in HOT_QUERIES.items():
+        cache.clear()
+        with _Recorder(engine) as recorder:
+            run(tournament, teams)
+        db.session.rollback()
+
+        for statement, parameters in recorder.statements:
+            with engine.connect() as connection:
+                scans, plan = explain(connection, statement, parameters)
+            forbidden = [index or table for table, index in scans
+                         if table not in allowed and index not in allowed]
+            results.append({
+                'query': name,
+                'statement': ' '.join(statement.split()),
+                'plan': plan,
+                'full_scans': forbidden,
+                'ok': not forbidden,
+            })
+    return results
@@ -0,0 +1,99 @@
+# revision.py
+"""Tournament revision counter.
+
+Every commit that changes a team, a player, a match, a round or the tournament
+settings increments ``tournaments.revision`` in the same transaction. The
+revision is read anyway by the ``before_request`` tournament lookup, so it gives every
+worker a free, cross-process "has anything changed?" check: ETags and the
+per-worker caches (cache.py) are keyed on it.
+
+``tournaments.roster_revision`` is incremented as well when teams or players
+are added, removed or renamed, so that data depending only on the roster
+(the search index, search.py) survives score entries.
+
+Changes are detected from the ORM unit of work (``before_flush``) and from
+bulk UPDATE/DELETE/INSERT statements (``do_orm_execute``). The new revision
+is left in ``session.info[COMMITTED]`` for the ``after_commit`` listeners
+(standings.py).
+"""
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+TRACKED_TABLES = frozenset({'teams', 'players', 'matches', 'rounds', 'tournaments'})
+ROSTER_TABLES = frozenset({'teams', 'players'})
+ROSTER_COLUMNS = frozenset({'name', 'team_id'})
+
+_DIRTY = 'revision_dirty'
+_ROSTER_DIRTY = 'revision_roster_dirty'
+_BUMPING = 'revision_bumping'
+COMMITTED = 'revision_committed'
+
+
+def _table(instance):
+    return getattr(instance, '__tablename__', None)
+
+
+def _renamed(instance):
+    attrs = inspect(instance).attrs
+    return any(attrs[column].history.has_changes() for column in ROSTER_COLUMNS if column in attrs)
+
+
+def _before_flush(session, flush_context, instances):
+    if any(_table(obj) in TRACKED_TABLES for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_DIRTY] = True
+    if (any(_table(obj) in ROSTER_TABLES for obj in (*session.new, *session.deleted))
+            or any(_table(obj) in ROSTER_TABLES and _renamed(obj) for obj in session.dirty)):
+        session.info[_ROSTER_DIRTY] = True
+
+
+def _do_orm_execute(orm_execute_state):
+    session = orm_execute_state.session
+    if session.info.get(_BUMPING):
+        return
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        name = getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None)
+        if name in TRACKED_TABLES:
+            session.info[_DIRTY] = True
+        # Bulk updates of teams only touch the aggregates (seed, reset, repair)
+        if name == 'players' or (name == 'teams' and not orm_execute_state.is_update):
+            session.info[_ROSTER_DIRTY] = True
+
+
+def _before_commit(session):
+    session.info.pop(COMMITTED, None)
+    # Flush first so that pending changes go through before_flush
+    session.flush()
+    roster = session.info.pop(_ROSTER_DIRTY, False)
+    if not session.info.pop(_DIRTY, False):
+        return
+
+    from models.tournament import Tournament
+
+    values = {'revision': Tournament.revision + 1}
+    if roster:
+        values['roster_revision'] = Tournament.roster_revision + 1
+    session.info[_BUMPING] = True
+    try:
+        session.info[COMMITTED] = session.execute(
+            update(Tournament)
+            .values(**values)
+            .returning(Tournament.revision)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+    finally:
+        session.info.pop(_BUMPING, None)
+
+
+def _after_rollback(session):
+    session.info.pop(_DIRTY, None)
+    session.info.pop(_ROSTER_DIRTY, None)
+    session.info.pop(COMMITTED, None)
+
+
+def init_app(app):
+    # Listeners are global to every Session: install them only once per process
+    if not event.contains(Session, 'before_commit', _before_commit):
+        event.listen(Session, 'before_flush', _before_flush)
+        event.listen(Session, 'do_orm_execute', _do_orm_execute)
+        event.listen(Session, 'before_commit', _before_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,99 @@
+# search.py
+"""Team and player search by prefix, for the navbar autocomplete.
+
+Names are folded (accents removed, case-folded, punctuation as spaces) and
+every word suffix of a name is a key of a sorted list: "Jean-Pierre Dupré"
+is found by "jean", "pierre" and "dupre". A query is a ``bisect`` in that
+list followed by a scan of the matching keys, a few microseconds even with
+thousands of players.
+
+The index is built per worker and rebuilt when ``tournaments.roster_revision``
+changes, i.e. after add_team, add_player, remove_team or remove_player in any
+worker (see revision.py); score entries leave it untouched.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+from flask import current_app, url_for
+
+from extensions import db
+from models.team import Team, Player
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_lock = threading.Lock()
+_separators = re.compile(r'[^\w]+|_')
+
+
+def fold(text):
+    """Lowercase, accent-free, single-spaced version of ``text``."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(_separators.sub(' ', stripped.casefold()).split())
+
+
+class SearchIndex:
+    """Sorted list of (folded key, entry number) over teams and players."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        keys = []
+        for number, entry in enumerate(entries):
+            words = fold(entry['name']).split()
+            for start in range(len(words)):
+                keys.append((' '.join(words[start:]), start, number))
+        keys.sort()
+        self.keys = keys
+        self._prefixes = [key for key, _, _ in keys]
+
+    @classmethod
+    def build(cls):
+        teams = db.session.execute(db.select(Team.id, Team.name)).all()
+        team_names = {team_id: name for team_id, name in teams}
+        players = db.session.execute(db.select(Player.id, Player.name, Player.team_id)).all()
+        entries = [{'type': 'team', 'id': team_id, 'name': name, 'team_id': team_id, 'team_name': name}
+                   for team_id, name in teams]
+        entries += [{'type': 'player', 'id': player_id, 'name': name,
+                     'team_id': team_id, 'team_name': team_names.get(team_id)}
+                    for player_id, name, team_id in players]
+        return cls(entries)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Entries having a word starting with ``query``; names that start with it come first."""
+        prefix = fold(query)
+        if not prefix:
+            return []
+
+        position = bisect.bisect_left(self._prefixes, prefix)
+        first_word, other_words, seen = [], [], set()
+        for key, start, number in self.keys[position:]:
+            if not key.startswith(prefix):
+                break
+            if number in seen:
+                continue
+            seen.add(number)
+            (first_word if start == 0 else other_words).append(self.entries[number])
+            if len(first_word) >= limit:
+                break
+        return (first_word + other_words)[:limit]
+
+
+def get_index(tournament):
+    """Index for the tournament's current roster, rebuilt when the roster changed."""
+    cached = current_app.extensions.get('search_index')
+    if cached is not None and cached[0] == tournament.roster_revision:
+        return cached[1]
+
+    index = SearchIndex.build()
+    with _lock:
+        current_app.extensions['search_index'] = (tournament.roster_revision, index)
+    return index
+
+
+def search(tournament, query, limit=DEFAULT_LIMIT):
+    """Search results as dicts with a ``url`` to the team page."""
+    return [dict(entry, url=url_for('team_detail', team_id=entry['team_id']))
+            for entry in get_index(tournament).search(query, limit)]
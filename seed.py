@@ -0,0 +1,97 @@
+# seed.py
+"""Demo data: a tournament with N teams and R rounds, inserted in bulk.
+
+Used by `flask seed-demo` and by the benchmarks to get a realistic table size
+in a fraction of a second (going through ``record_score`` would take minutes
+for a 300 teams / 15 rounds event).
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from extensions import db
+from models.team import Team, Player
+from models.match import Match
+from models.round import Round
+from models.user import User
+
+
+def seed_tournament(teams=64, rounds=5, finish_last_round=True, seed=0):
+    """Insert ``teams`` teams (2 players each) and ``rounds`` rounds of matches.
+
+    Rounds before the last are played and closed; the last round is played only
+    when ``finish_last_round`` is true. Team aggregates match the inserted
+    matches. Must be called inside an application context.
+    """
+    rng = random.Random(seed)
+
+    # An empty list would insert one row of defaults: every insert is skipped when empty
+    if teams > 0:
+        db.session.execute(insert(Team), [
+            {'name': f'Équipe {i:03d}', 'matches_played': 0, 'points_for': 0, 'points_against': 0}
+            for i in range(1, teams + 1)
+        ])
+    team_ids = db.session.execute(select(Team.id).order_by(Team.id)).scalars().all()
+
+    if team_ids:
+        db.session.execute(insert(Player), [
+            {'name': f'Joueur {team_id}-{n}', 'team_id': team_id}
+            for team_id in team_ids for n in (1, 2)
+        ])
+
+    stats = {team_id: {'id': team_id, 'matches_played': 0, 'points_for': 0, 'points_against': 0}
+             for team_id in team_ids}
+    start = datetime(2026, 1, 1, 14, 0)
+    matches = []
+    for round_number in range(1, rounds + 1):
+        order = list(team_ids)
+        rng.shuffle(order)
+        played = round_number < rounds or finish_last_round
+        date = (start + timedelta(minutes=45 * round_number)).strftime("%d/%m/%Y %H:%M:%S")
+
+        for table_number, i in enumerate(range(0, len(order) - 1, 2), start=1):
+            team1_id, team2_id = order[i], order[i + 1]
+            score1 = score2 = None
+            if played:
+                score1, score2 = rng.randint(40, 162), rng.randint(40, 162)
+                for team_id, scored, conceded in ((team1_id, score1, score2), (team2_id, score2, score1)):
+                    stats[team_id]['matches_played'] += 1
+                    stats[team_id]['points_for'] += scored
+                    stats[team_id]['points_against'] += conceded
+            matches.append({
+                'team1_id': team1_id,
+                'team2_id': team2_id,
+                'score1': score1,
+                'score2': score2,
+                'round_number': round_number,
+                'table_number': table_number,
+                'is_closed': round_number < rounds,
+                'date': date if played else None,
+            })
+
+    if matches:
+        db.session.execute(insert(Match), matches)
+        db.session.execute(insert(Round), [
+            {
+                'number': round_number,
+                'status': Round.STATUS_OPEN if round_number == rounds else Round.STATUS_CLOSED,
+                'created_at': start + timedelta(minutes=45 * (round_number - 1)),
+                'closed_at': None if round_number == rounds else start + timedelta(minutes=45 * round_number),
+            }
+            for round_number in range(1, rounds + 1)
+        ])
+    if stats:
+        db.session.execute(update(Team), list(stats.values()))
+    db.session.commit()
+
+
+def ensure_admin(username='admin', password='admin'):
+    """Create the admin account if it does not exist yet."""
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        user = User(username=username)
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+    return user
@@ -0,0 +1,177 @@
+# sqlite_local.py
+"""Venue-local deployment on SQLite (a laptop, no internet).
+
+Without ``DATABASE_URL`` the app uses the SQLite file ``SQLITE_PATH``
+(default ``instance/belote.db``). Every new connection is configured for
+concurrent scorekeepers and spectators through an engine ``connect`` hook:
+
+- ``journal_mode=WAL``: readers never block the writer and vice versa;
+- ``synchronous=NORMAL``: safe with WAL, one fsync per checkpoint instead
+  of one per commit;
+- ``busy_timeout``: a writer waits for the write lock instead of failing
+  with "database is locked".
+
+Each request thread checks out its own connection from the pool (never
+shared between threads). ``backup_database`` copies the live database with
+SQLite's online backup API; ``start_backup_thread`` runs it every
+``SQLITE_BACKUP_INTERVAL`` seconds, see also ``flask backup-db``.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process serves the app anyway
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+BACKUP_PREFIX = 'belote-'
+
+
+def configure(app):
+    """Fill in the SQLite URI and engine options; call before ``db.init_app``."""
+    if not app.config.get('SQLALCHEMY_DATABASE_URI'):
+        path = app.config['SQLITE_PATH'] or os.path.join(app.instance_path, 'belote.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.abspath(path)}'
+
+    if not is_sqlite(app) or not app.config['SQLITE_TUNING'] or database_path(app) is None:
+        return
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    connect_args = dict(options.get('connect_args') or {})
+    # busy_timeout is also set by PRAGMA below; the driver timeout covers BEGIN IMMEDIATE
+    connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+    connect_args.setdefault('check_same_thread', False)
+    options['connect_args'] = connect_args
+    options.setdefault('pool_size', app.config['SQLITE_POOL_SIZE'])
+    options.setdefault('max_overflow', app.config['SQLITE_POOL_SIZE'])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def is_sqlite(app):
+    return app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+
+
+def database_path(app):
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    path = uri.split(':///', 1)[1] if ':///' in uri else ''
+    if path in ('', ':memory:'):
+        return None
+    # Flask-SQLAlchemy resolves relative SQLite paths from the instance folder
+    return path if os.path.isabs(path) else os.path.join(app.instance_path, path)
+
+
+def _pragmas(app):
+    return (
+        'PRAGMA journal_mode=WAL' if app.config['SQLITE_WAL'] else None,
+        f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+    )
+
+
+def init_app(app, db):
+    """Install the connection hook on the app's engine; call after ``db.init_app``."""
+    if not is_sqlite(app) or not app.config['SQLITE_TUNING'] or database_path(app) is None:
+        return
+
+    pragmas = [pragma for pragma in _pragmas(app) if pragma]
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    with app.app_context():
+        event.listen(db.engine, 'connect', on_connect)
+
+    if app.config['SQLITE_BACKUP_INTERVAL'] > 0:
+        # Started on the first request: after gunicorn has forked the workers
+        started = []
+
+        def start_backups():
+            if not started:
+                started.append(start_backup_thread(app))
+
+        app.before_request(start_backups)
+
+
+def backup_dir(app):
+    return app.config['SQLITE_BACKUP_DIR'] or os.path.join(app.instance_path, 'backups')
+
+
+def backup_database(app, keep=None):
+    """Copy the live database into the backup directory; return the backup path.
+
+    The copy is done in a single backup step: with WAL it only holds a read
+    snapshot, so scorekeepers keep writing while it runs.
+    """
+    source_path = database_path(app)
+    if source_path is None:
+        raise RuntimeError("La sauvegarde en ligne nécessite une base SQLite sur disque.")
+
+    directory = backup_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    target_path = os.path.join(directory, f"{BACKUP_PREFIX}{datetime.now():%Y%m%d-%H%M%S}.db")
+
+    source = sqlite3.connect(source_path, timeout=app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+    _rotate(directory, app.config['SQLITE_BACKUP_KEEP'] if keep is None else keep)
+    return target_path
+
+
+def _rotate(directory, keep):
+    backups = sorted(name for name in os.listdir(directory)
+                     if name.startswith(BACKUP_PREFIX) and name.endswith('.db'))
+    for name in backups[:-keep] if keep > 0 else []:
+        os.remove(os.path.join(directory, name))
+
+
+def _acquire_backup_lock(app):
+    """Only one process (gunicorn worker) runs the periodic backups."""
+    if fcntl is None:
+        return True
+    os.makedirs(app.instance_path, exist_ok=True)
+    handle = open(os.path.join(app.instance_path, 'backup.lock'), 'w')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    app.extensions['sqlite_backup_lock'] = handle  # kept open for the life of the process
+    return True
+
+
+def start_backup_thread(app):
+    """Back up the database every SQLITE_BACKUP_INTERVAL seconds in a daemon thread."""
+    if not _acquire_backup_lock(app):
+        return None
+
+    interval = app.config['SQLITE_BACKUP_INTERVAL']
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                path = backup_database(app)
+                log.info("Sauvegarde de la base : %s", path)
+            except Exception:
+                log.exception("Échec de la sauvegarde de la base")
+
+    thread = threading.Thread(target=run, name='sqlite-backup', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,312 @@
+# standings.py
+"""Per-worker standings index: rank, top-k and neighbours without sorting.
+
+The teams are kept in an order-statistic tree (a treap whose nodes know the
+size of their subtree) keyed by the ranking system's sort key, so the rank
+of a team, the k first teams and the teams around one are found in
+O(log n).
+
+The index carries the tournament revision it reflects (revision.py):
+
+- a commit that changes team totals or match results in this worker is
+  applied in place after the commit, one O(log n) remove/insert per team,
+  when the index was current right before that commit;
+- anything else (another worker's commit, round generation, reset, bulk
+  updates, a change of ranking system) leaves the index behind the
+  tournament's revision, and it is rebuilt on the next access.
+"""
+import random
+import threading
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+import revision as revision_counter
+from models.match import Match
+from models.query_profiles import with_profile
+from models.team import Team
+
+_CHANGES = 'standings_changes'
+
+_lock = threading.Lock()
+
+
+def sort_key(ranking_system, points_for, points_against, soccer_points=0):
+    """Sort key of a team's totals under ``ranking_system`` (best team first)."""
+    point_difference = points_for - points_against
+    if ranking_system == 'soccer_style':
+        return (-soccer_points, -point_difference, -points_for)
+    return (-points_for, -point_difference, points_against)
+
+
+def soccer_points(score, other):
+    """3 points for a win, 1 for a draw, 0 for a loss."""
+    return 3 if score > other else 1 if score == other else 0
+
+
+class _Node:
+    __slots__ = ('key', 'priority', 'size', 'left', 'right')
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+def _split(node, key, inclusive=False):
+    """``(keys < key, keys >= key)``, or ``<=`` / ``>`` with ``inclusive``."""
+    if node is None:
+        return None, None
+    if node.key < key or (inclusive and node.key == key):
+        left, right = _split(node.right, key, inclusive)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key, inclusive)
+    node.left = right
+    return left, _update(node)
+
+
+def _merge(left, right):
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+class OrderStatisticTree:
+    """Sorted set of unique keys with O(log n) insert, remove, rank and select."""
+
+    def __init__(self, keys=()):
+        self.root = None
+        self._random = random.Random(0)
+        for key in keys:
+            self.insert(key)
+
+    def __len__(self):
+        return _size(self.root)
+
+    def insert(self, key):
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key, self._random.random())), right)
+
+    def remove(self, key):
+        left, right = _split(self.root, key)
+        _, right = _split(right, key, inclusive=True)
+        self.root = _merge(left, right)
+
+    def rank(self, key):
+        """Number of keys smaller than ``key``."""
+        node, smaller = self.root, 0
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                smaller += _size(node.left) + 1
+                node = node.right
+        return smaller
+
+    def select(self, index):
+        """Key at position ``index`` (0-based)."""
+        node = self.root
+        while node is not None:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key
+            else:
+                index -= left_size + 1
+                node = node.right
+        raise IndexError(index)
+
+    def __iter__(self):
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+
+class StandingsIndex:
+    """Standings rows of one revision, ordered by an OrderStatisticTree."""
+
+    def __init__(self, revision, ranking_system, rows):
+        self.revision = revision
+        self.ranking_system = ranking_system
+        self.rows = {row['id']: row for row in rows}
+        self.tree = OrderStatisticTree(self._key(row) for row in rows)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, tournament):
+        teams = with_profile(Team.query, 'team_ranking').all()
+        # Soccer points are only read (and kept up to date) by the soccer-style ranking
+        soccer = tournament._calculate_all_soccer_points() if tournament.ranking_system == 'soccer_style' else {}
+        rows = [{
+            'id': team.id,
+            'name': team.name,
+            'matches_played': team.matches_played or 0,
+            'points_for': team.points_for or 0,
+            'points_against': team.points_against or 0,
+            'soccer_points': soccer.get(team.id, 0),
+        } for team in teams]
+        return cls(tournament.revision, tournament.ranking_system, rows)
+
+    def _key(self, row):
+        # The team id breaks ties and makes every key unique
+        return (*sort_key(self.ranking_system, row['points_for'], row['points_against'], row['soccer_points']),
+                row['id'])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def rank(self, team_id):
+        """1-based rank of the team, or None if unknown."""
+        row = self.rows.get(team_id)
+        if row is None:
+            return None
+        with self.lock:
+            return self.tree.rank(self._key(row)) + 1
+
+    def _rows_between(self, start, stop):
+        return [self.rows[self.tree.select(index)[-1]] for index in range(max(start, 0), min(stop, len(self.tree)))]
+
+    def top(self, count):
+        """The ``count`` first rows."""
+        with self.lock:
+            return self._rows_between(0, count)
+
+    def neighbours(self, team_id, count=2):
+        """``(rank, row)`` of the team and of up to ``count`` teams above and below it."""
+        rank = self.rank(team_id)
+        if rank is None:
+            return []
+        with self.lock:
+            rows = self._rows_between(rank - 1 - count, rank + count)
+        first = max(rank - count, 1)
+        return list(enumerate(rows, start=first))
+
+    def ordered(self):
+        """Every row, in ranking order."""
+        with self.lock:
+            return [self.rows[key[-1]] for key in self.tree]
+
+    def apply(self, teams, soccer):
+        """Update the totals of ``teams`` (``{id: values}``) and soccer point deltas."""
+        if self.ranking_system != 'soccer_style':
+            soccer = {}
+        with self.lock:
+            for team_id in set(teams) | set(soccer):
+                row = self.rows[team_id]
+                self.tree.remove(self._key(row))
+                row = dict(row, **teams.get(team_id, {}))
+                row['soccer_points'] += soccer.get(team_id, 0)
+                self.rows[team_id] = row
+                self.tree.insert(self._key(row))
+
+
+def get_index(tournament):
+    """Index for the tournament's current revision and ranking system."""
+    index = current_app.extensions.get('standings_index')
+    if (index is not None and index.revision == tournament.revision
+            and index.ranking_system == tournament.ranking_system):
+        return index
+
+    index = StandingsIndex.build(tournament)
+    with _lock:
+        current_app.extensions['standings_index'] = index
+    return index
+
+
+# Incremental updates from the ORM unit of work
+
+def _changes(session):
+    return session.info.setdefault(_CHANGES, {'teams': {}, 'soccer': {}, 'rebuild': False})
+
+
+def _score_history(match, attribute):
+    history = inspect(match).attrs[attribute].history
+    old = history.deleted[0] if history.deleted else getattr(match, attribute)
+    return old, getattr(match, attribute)
+
+
+def _before_flush(session, flush_context, instances):
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Team) or (isinstance(obj, Match) and obj in session.deleted):
+            _changes(session)['rebuild'] = True
+            return
+    for obj in session.dirty:
+        if isinstance(obj, Team) and session.is_modified(obj):
+            _changes(session)['teams'][obj.id] = {
+                'name': obj.name,
+                'matches_played': obj.matches_played or 0,
+                'points_for': obj.points_for or 0,
+                'points_against': obj.points_against or 0,
+            }
+        elif isinstance(obj, Match):
+            old_score1, score1 = _score_history(obj, 'score1')
+            old_score2, score2 = _score_history(obj, 'score2')
+            if (old_score1, old_score2) == (score1, score2):
+                continue
+            soccer = _changes(session)['soccer']
+            for team_id, scores in ((obj.team1_id, (0, 1)), (obj.team2_id, (1, 0))):
+                delta = 0
+                if old_score1 is not None and old_score2 is not None:
+                    old = (old_score1, old_score2)
+                    delta -= soccer_points(old[scores[0]], old[scores[1]])
+                if score1 is not None and score2 is not None:
+                    new = (score1, score2)
+                    delta += soccer_points(new[scores[0]], new[scores[1]])
+                soccer[team_id] = soccer.get(team_id, 0) + delta
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        name = getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None)
+        if name in ('teams', 'matches'):
+            # Set-based statements (round generation, reset, repair): rebuild
+            _changes(orm_execute_state.session)['rebuild'] = True
+
+
+def _after_commit(session):
+    changes = session.info.pop(_CHANGES, None)
+    revision = session.info.get(revision_counter.COMMITTED)
+    if not has_app_context() or revision is None:
+        return
+    index = current_app.extensions.get('standings_index')
+    if index is None or index.revision != revision - 1 or (changes and changes['rebuild']):
+        return  # Rebuilt from the database on the next access
+    if changes:
+        index.apply(changes['teams'], changes['soccer'])
+    index.revision = revision
+
+
+def _after_rollback(session):
+    session.info.pop(_CHANGES, None)
+
+
+def init_app(app):
+    # Listeners are global to every Session: install them only once per process
+    if not event.contains(Session, 'after_commit', _after_commit):
+        event.listen(Session, 'before_flush', _before_flush)
+        event.listen(Session, 'do_orm_execute', _do_orm_execute)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
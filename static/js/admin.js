@@ -0,0 +1,29 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const matchSelect = document.getElementById('match');
+    const team1ScoreLabel = document.getElementById('team1_score_label');
+    const team2ScoreLabel = document.getElementById('team2_score_label');
+    const updateMatchForm = document.getElementById('updateMatchForm');
+
+    // Fonction pour mettre à jour l'action du formulaire et les labels
+    function updateFormAction() {
+        const selectedOption = matchSelect.options[matchSelect.selectedIndex];
+        const matchId = selectedOption.value;
+        const team1 = selectedOption.getAttribute('data-team1');
+        const team2 = selectedOption.getAttribute('data-team2');
+
+        // Mettre à jour l'action du formulaire
+        updateMatchForm.action = `/update_match_result/${matchId}`;
+
+        // Mettre à jour les labels avec les noms des équipes
+        team1ScoreLabel.textContent = `Score ${team1}`;
+        team2ScoreLabel.textContent = `Score ${team2}`;
+    }
+
+    // Sélectionner le premier match par défaut
+    if (matchSelect.options.length > 0) {
+        updateFormAction();
+    }
+
+    // Mettre à jour l'action et les labels lors du changement de sélection
+    matchSelect.addEventListener('change', updateFormAction);
+});
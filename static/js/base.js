@@ -0,0 +1,18 @@
+function toggleInfoPanel() {
+    const panel = document.getElementById('infoPanel');
+    const btn = document.getElementById('togglePanelBtn');
+    panel.classList.toggle('collapsed');
+
+    // Save preference to localStorage
+    const isCollapsed = panel.classList.contains('collapsed');
+    localStorage.setItem('infoPanelCollapsed', isCollapsed);
+}
+
+// Restore panel state on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const isCollapsed = localStorage.getItem('infoPanelCollapsed') === 'true';
+    const panel = document.getElementById('infoPanel');
+    if (isCollapsed) {
+        panel.classList.add('collapsed');
+    }
+});
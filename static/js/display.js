@@ -0,0 +1,131 @@
+// Affichage salle : pages du classement puis des tables du tour en cours,
+// données rafraîchies par deltas (voir display.py)
+(function() {
+    const config = window.DISPLAY_CONFIG;
+    const head = document.getElementById('board-head');
+    const body = document.getElementById('board-body');
+    const title = document.getElementById('title');
+    const pager = document.getElementById('pager');
+    const statusLine = document.getElementById('status');
+
+    // Colonnes de display.STANDINGS_COLUMNS / TABLES_COLUMNS
+    const ID = 0, NAME = 1, PLAYED = 2, POINTS_FOR = 3, DIFF = 4, SOCCER = 5;
+
+    const state = {revision: null, rankingSystem: null, round: null, order: [], standings: new Map(), tables: new Map()};
+    let pageIndex = 0;
+
+    function apply(data) {
+        if (data.full) {
+            state.standings.clear();
+            state.tables.clear();
+            state.rankingSystem = data.ranking_system;
+        }
+        data.standings.forEach(row => state.standings.set(row[ID], row));
+        (data.removed || []).forEach(id => state.standings.delete(id));
+        data.tables.forEach(row => state.tables.set(row[0], row));
+        if (data.order) {
+            state.order = data.order;
+        }
+        state.revision = data.revision;
+        state.round = data.round;
+    }
+
+    function pages() {
+        const result = [];
+        // Le serveur borne déjà rows ; une taille nulle bouclerait sans fin
+        const size = Math.max(1, config.rowsPerPage);
+        for (let i = 0; i < state.order.length; i += size) {
+            result.push({kind: 'standings', start: i, end: i + size});
+        }
+        const tableCount = state.tables.size;
+        for (let i = 0; i < tableCount; i += size) {
+            result.push({kind: 'tables', start: i, end: i + size});
+        }
+        return result;
+    }
+
+    function cell(tr, value, numeric) {
+        const td = document.createElement('td');
+        td.textContent = value === null || value === undefined ? '-' : value;
+        if (numeric) {
+            td.className = 'num';
+        }
+        tr.appendChild(td);
+    }
+
+    function header(columns) {
+        head.innerHTML = '<tr>' + columns.map(([label, numeric]) =>
+            `<th${numeric ? ' class="num"' : ''}>${label}</th>`).join('') + '</tr>';
+    }
+
+    function render() {
+        const all = pages();
+        if (all.length === 0) {
+            title.textContent = 'Tournoi de Belote';
+            pager.textContent = '';
+            head.innerHTML = '';
+            body.replaceChildren();
+            return;
+        }
+        pageIndex = pageIndex % all.length;
+        const page = all[pageIndex];
+        const rows = [];
+
+        if (page.kind === 'standings') {
+            const soccer = state.rankingSystem === 'soccer_style';
+            title.textContent = 'Classement';
+            header([['#', true], ['Équipe', false], ['MJ', true]]
+                .concat(soccer ? [['Pts', true]] : [])
+                .concat([['PF', true], ['Diff', true]]));
+            state.order.slice(page.start, page.end).forEach((id, i) => {
+                const team = state.standings.get(id);
+                const tr = document.createElement('tr');
+                cell(tr, page.start + i + 1, true);
+                cell(tr, team[NAME]);
+                cell(tr, team[PLAYED], true);
+                if (soccer) {
+                    cell(tr, team[SOCCER], true);
+                }
+                cell(tr, team[POINTS_FOR], true);
+                cell(tr, (team[DIFF] > 0 ? '+' : '') + team[DIFF], true);
+                rows.push(tr);
+            });
+        } else {
+            title.textContent = `Tour ${state.round} - Tables`;
+            header([['Table', true], ['Équipe 1', false], ['Équipe 2', false], ['Score', true]]);
+            const numbers = Array.from(state.tables.keys()).sort((a, b) => a - b);
+            numbers.slice(page.start, page.end).forEach(number => {
+                const [table, team1, team2, score1, score2] = state.tables.get(number);
+                const tr = document.createElement('tr');
+                cell(tr, table, true);
+                cell(tr, team1);
+                cell(tr, team2);
+                cell(tr, score1 === null ? '' : `${score1} - ${score2}`, true);
+                rows.push(tr);
+            });
+        }
+        body.replaceChildren(...rows);
+        pager.textContent = `${pageIndex + 1} / ${all.length}`;
+    }
+
+    async function poll() {
+        const url = state.revision === null ? config.dataUrl : `${config.dataUrl}?since=${state.revision}`;
+        try {
+            const response = await fetch(url, {cache: 'no-store'});
+            if (response.status === 200) {
+                apply(await response.json());
+                render();
+            }
+            statusLine.textContent = '';
+        } catch (error) {
+            statusLine.textContent = 'Connexion perdue, nouvel essai…';
+        }
+    }
+
+    poll();
+    setInterval(poll, config.pollSeconds * 1000);
+    setInterval(() => {
+        pageIndex += 1;
+        render();
+    }, Math.max(1, config.pageSeconds) * 1000);
+})();
@@ -0,0 +1,27 @@
+// Suivi d'une tâche d'administration en arrière-plan (voir jobs.py) :
+// la page se recharge quand la tâche est terminée, le serveur redirige alors vers le résultat
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('job');
+    const message = document.getElementById('job-message');
+    const progress = document.getElementById('job-progress');
+
+    function poll() {
+        fetch(container.dataset.statusUrl, {headers: {'Accept': 'application/json'}})
+            .then(response => response.json())
+            .then(job => {
+                if (job.status === 'done' || job.status === 'failed') {
+                    window.location.reload();
+                    return;
+                }
+                if (job.message) {
+                    message.textContent = job.message;
+                }
+                progress.style.width = `${job.progress}%`;
+                progress.setAttribute('aria-valuenow', job.progress);
+                setTimeout(poll, 1000);
+            })
+            .catch(() => setTimeout(poll, 3000));
+    }
+
+    setTimeout(poll, 500);
+});
@@ -0,0 +1,25 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const matchSelect = document.getElementById('match');
+    const team1ScoreLabel = document.getElementById('team1_score_label');
+    const team2ScoreLabel = document.getElementById('team2_score_label');
+
+    // Sélectionner le premier match par défaut
+    if (matchSelect.options.length > 0) {
+        const firstOption = matchSelect.options[0];
+        const team1 = firstOption.getAttribute('data-team1');
+        const team2 = firstOption.getAttribute('data-team2');
+
+        team1ScoreLabel.textContent = `Score ${team1}`;
+        team2ScoreLabel.textContent = `Score ${team2}`;
+    }
+
+    // Mettre à jour les labels lors du changement de sélection
+    matchSelect.addEventListener('change', function() {
+        const selectedOption = this.options[this.selectedIndex];
+        const team1 = selectedOption.getAttribute('data-team1');
+        const team2 = selectedOption.getAttribute('data-team2');
+
+        team1ScoreLabel.textContent = `Score ${team1}`;
+        team2ScoreLabel.textContent = `Score ${team2}`;
+    });
+});
@@ -0,0 +1,60 @@
+// Autocomplétion de la recherche d'équipes et de joueurs (navbar)
+document.addEventListener('DOMContentLoaded', function() {
+    const input = document.getElementById('navbarSearch');
+    const results = document.getElementById('navbarSearchResults');
+    if (!input) {
+        return;
+    }
+
+    let timer = null;
+    let lastQuery = '';
+
+    function clear() {
+        results.replaceChildren();
+    }
+
+    function show(items) {
+        clear();
+        items.forEach(item => {
+            const link = document.createElement('a');
+            link.href = item.url;
+            link.className = 'list-group-item list-group-item-action py-1';
+            link.textContent = item.name;
+            const detail = document.createElement('small');
+            detail.className = 'text-muted ms-2';
+            detail.textContent = item.type === 'team' ? 'équipe' : item.team_name;
+            link.appendChild(detail);
+            results.appendChild(link);
+        });
+    }
+
+    async function lookup(query) {
+        const response = await fetch(`${input.dataset.api}?q=${encodeURIComponent(query)}`);
+        if (response.ok && query === lastQuery) {
+            show((await response.json()).items);
+        }
+    }
+
+    input.addEventListener('input', function() {
+        const query = input.value.trim();
+        lastQuery = query;
+        clearTimeout(timer);
+        if (!query) {
+            clear();
+            return;
+        }
+        timer = setTimeout(() => lookup(query), 120);
+    });
+
+    input.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape') {
+            clear();
+        }
+    });
+
+    document.addEventListener('click', function(event) {
+        if (!results.contains(event.target) && event.target !== input) {
+            clear();
+        }
+    });
+});
@@ -0,0 +1,235 @@
+# table_scores.py
+"""Score entry by the table captains (``/table/<token>``).
+
+Each table of the current round gets a link signed with ``SECRET_KEY``
+(``/admin/tables``, to print or send to the captains). The token names the
+match: round, table number and the two teams, so it stops working as soon as
+the table is reassigned (next round, reset).
+
+At the end of a round most tables submit within a few minutes. Instead of one
+``record_score`` transaction per phone, all contending for the ``teams`` rows
+(and for the single SQLite write lock), submissions are handed to one writer
+thread per process. The writer takes everything queued (waiting
+``TABLE_SCORES_WINDOW_MS`` for stragglers, at most ``TABLE_SCORES_BATCH``) and
+records it in a single transaction under ``locks.exclusive_transaction``, so
+the writers of several gunicorn workers take turns as well. The captain's
+request waits for that commit: the result is acknowledged only once it is in
+the database. Batches only form when a worker serves several requests at once
+(threaded workers, see the Procfile); with sync workers each result is still
+written, one transaction each.
+
+A repeated submission of the same result is acknowledged again; a different
+result for an already scored table is refused (the organizer corrects it from
+the matches page as usual).
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from flask import Blueprint, abort, current_app, flash, g, redirect, render_template, request, url_for
+from flask_login import login_required
+from itsdangerous import BadSignature, URLSafeSerializer
+
+import locks
+from extensions import db
+from models.match import Match
+from models.query_profiles import with_profile
+from models.team import Team
+
+log = logging.getLogger(__name__)
+
+bp = Blueprint('tables', __name__)
+
+TOKEN_SALT = 'table-score'
+MAX_SCORE = 10000
+
+RECORDED = 'recorded'
+DUPLICATE = 'duplicate'
+CONFLICT = 'conflict'
+STALE = 'stale'
+
+_lock = threading.Lock()
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+
+def _match_key(match):
+    return [match.id, match.round_number, match.table_number, match.team1_id, match.team2_id]
+
+
+def table_token(match):
+    """Signed token of the match's table."""
+    return _serializer().dumps(_match_key(match))
+
+
+def read_token(token):
+    """``[match_id, round_number, table_number, team1_id, team2_id]``, or None if the signature is wrong."""
+    try:
+        key = _serializer().loads(token)
+    except BadSignature:
+        return None
+    if not isinstance(key, list) or len(key) != 5:
+        return None
+    return key
+
+
+def find_match(key):
+    """The match named by a token, or None if the table was reassigned since."""
+    match = with_profile(Match.query, 'match_with_teams').filter(Match.id == key[0]).first()
+    if match is None or _match_key(match) != key:
+        return None
+    return match
+
+
+class Submission:
+    """Result sent by a captain; ``future`` resolves to its status once committed."""
+
+    def __init__(self, key, score1, score2):
+        self.key = key
+        self.score1 = score1
+        self.score2 = score2
+        self.future = Future()
+
+
+def apply_batch(submissions):
+    """Stage the results of ``submissions`` in the session; return their statuses (no commit)."""
+    match_ids = {submission.key[0] for submission in submissions}
+    matches = {match.id: match for match in Match.query.filter(Match.id.in_(match_ids))}
+    team_ids = {team_id for match in matches.values() for team_id in (match.team1_id, match.team2_id)}
+    # Load both teams of every match at once; apply_score finds them in the identity map
+    Team.query.filter(Team.id.in_(team_ids)).all()
+
+    statuses = []
+    for submission in submissions:
+        match = matches.get(submission.key[0])
+        if match is None or _match_key(match) != submission.key:
+            statuses.append(STALE)
+        elif match.score1 is None:
+            match.apply_score(submission.score1, submission.score2)
+            statuses.append(RECORDED)
+        elif (match.score1, match.score2) == (submission.score1, submission.score2):
+            statuses.append(DUPLICATE)
+        else:
+            statuses.append(CONFLICT)
+    return statuses
+
+
+class Writer:
+    """Single writer thread of the process, committing queued submissions in batches."""
+
+    def __init__(self, app):
+        self.app = app
+        self.pid = os.getpid()
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.thread = threading.Thread(target=self._run, name='table-scores', daemon=True)
+        self.thread.start()
+
+    def submit(self, submission):
+        self.queue.put(submission)
+        return submission.future
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        size = self.app.config['TABLE_SCORES_BATCH']
+        deadline = time.monotonic() + self.app.config['TABLE_SCORES_WINDOW_MS'] / 1000
+        while len(batch) < size:
+            try:
+                batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                with self.app.app_context():
+                    with locks.exclusive_transaction('table-scores'):
+                        statuses = apply_batch(batch)
+            except Exception as error:
+                log.exception("Échec de l'enregistrement de %d résultat(s) de table", len(batch))
+                for submission in batch:
+                    submission.future.set_exception(error)
+                continue
+            self.batches += 1
+            for submission, status in zip(batch, statuses):
+                submission.future.set_result(status)
+
+
+def get_writer(app=None):
+    """Writer of the current process, started on first use (after gunicorn's fork)."""
+    app = app or current_app._get_current_object()
+    with _lock:
+        writer = app.extensions.get('table_scores_writer')
+        if writer is None or writer.pid != os.getpid():
+            writer = app.extensions['table_scores_writer'] = Writer(app)
+        return writer
+
+
+def _score(name):
+    try:
+        score = int(request.form.get(name, ''))
+    except ValueError:
+        return None
+    return score if 0 <= score <= MAX_SCORE else None
+
+
+@bp.route('/table/<token>', methods=['GET', 'POST'])
+def table(token):
+    key = read_token(token)
+    if key is None:
+        abort(404)
+    match = find_match(key)
+
+    if request.method == 'POST' and match is not None:
+        score1, score2 = _score('score1'), _score('score2')
+        if score1 is None or score2 is None:
+            flash(f"Les scores doivent être des nombres entre 0 et {MAX_SCORE}.", 'error')
+            return redirect(url_for('tables.table', token=token))
+
+        # Give the connection back to the pool while the writer works
+        db.session.rollback()
+        future = get_writer().submit(Submission(key, score1, score2))
+        try:
+            status = future.result(timeout=current_app.config['TABLE_SCORES_TIMEOUT'])
+        except FutureTimeout:
+            flash("Le résultat est en cours d'enregistrement : rechargez la page dans quelques instants.", 'error')
+            return redirect(url_for('tables.table', token=token))
+        except Exception:
+            flash("Le résultat n'a pas pu être enregistré, veuillez réessayer.", 'error')
+            return redirect(url_for('tables.table', token=token))
+
+        if status in (RECORDED, DUPLICATE):
+            flash("Résultat enregistré, merci !", 'success')
+        elif status == CONFLICT:
+            flash("Un autre résultat est déjà enregistré pour cette table : adressez-vous à l'organisateur.", 'error')
+        else:
+            flash("Ce lien ne correspond plus à un match en cours.", 'error')
+        return redirect(url_for('tables.table', token=token))
+
+    return render_template('table.html', match=match, round_number=key[1], table_number=key[2])
+
+
+@bp.route('/admin/tables')
+@login_required
+def links():
+    """Captain links of the current round's tables."""
+    round_number = g.tournament.get_current_round()
+    matches = (with_profile(Match.query, 'match_with_teams')
+               .filter(Match.round_number == round_number)
+               .order_by(Match.table_number).all())
+    tables = [{
+        'table_number': match.table_number,
+        'team1': match.team1.name,
+        'team2': match.team2.name,
+        'score1': match.score1,
+        'score2': match.score2,
+        'url': url_for('tables.table', token=table_token(match), _external=True),
+    } for match in matches]
+    return render_template('tables.html', tables=tables, round_number=round_number)
@@ -0,0 +1,358 @@
+# views.py
+from flask import render_template, request, redirect, url_for, flash, g
+from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
+
+import archive
+import cache
+import idempotency
+import identity
+import jobs
+import search as team_search
+import standings as standings_index
+from extensions import db
+from models.team import Team
+from models.match import Match
+from models.tournament import Tournament
+from models.user import User
+from models.archive import TournamentArchive
+
+
+def index():
+    return render_template('index.html')
+
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+
+        user = User.query.filter_by(username=username).first()
+
+        if user and user.check_password(password):
+            identity.login(user)
+            return redirect(url_for('admin'))
+
+        flash('Nom d\'utilisateur ou mot de passe incorrect.')
+    return render_template('login.html')
+
+def logout():
+    identity.logout()
+    return redirect(url_for('ranking'))
+
+
+def team_detail(team_id):
+    team = Team.query.get(team_id)
+    if not team:
+        return redirect(url_for('admin'))
+
+    if request.method == 'POST':
+        if 'add_player' in request.form:
+            player_name = request.form.get('player_name')
+            if player_name and len(team.players) < 2:
+                if team.add_player(player_name):
+                    flash(f"Le joueur {player_name} a été ajouté à l'équipe {team.name} avec succès.", 'success')
+                else:
+                    flash(f"Impossible d'ajouter le joueur {player_name} à l'équipe {team.name}.", 'error')
+            else:
+                flash(f"L'équipe a déjà 2 joueurs.", 'error')
+            return redirect(url_for('team_detail', team_id=team.id))
+        elif 'remove_player' in request.form:
+            player_name = request.form.get('player_name')
+            if player_name:
+                if team.remove_player(player_name):
+                    flash(f"Le joueur {player_name} a été retiré de l'équipe {team.name} avec succès.", 'success')
+                else:
+                    flash(f"Impossible de retirer le joueur {player_name} de l'équipe {team.name}.", 'error')
+            return redirect(url_for('team_detail', team_name=team.id))
+
+    team_matches = cache.get_team_matches(g.tournament, team.id)
+    index = standings_index.get_index(g.tournament)
+
+    return render_template('team_detail.html', team=team, matches=team_matches, is_admin=current_user.is_authenticated,
+                           rank=index.rank(team.id), team_count=len(index), neighbours=index.neighbours(team.id),
+                           tournament=g.tournament)
+
+
+def matches():
+    tournament = g.tournament
+    if request.method == 'POST':
+        if not current_user.is_authenticated:
+            flash('Vous devez être connecté pour administrer le tournois.', 'error')
+            return redirect(url_for('login'))
+        
+        if 'record_match' in request.form:
+            # Double envoi / nouvelle tentative : renvoyer la réponse d'origine sans rien modifier
+            key = idempotency.request_key()
+            match_id = request.form.get('match_id', type=int)
+            try:
+                previous = idempotency.lookup(key, 'record_match', match_id)
+            except idempotency.KeyReused:
+                return _reused_key()
+            if previous:
+                return redirect(previous.location)
+
+            if match_id:
+                match = db.session.get(Match, match_id)
+                score1 = int(request.form.get('score1'))
+                score2 = int(request.form.get('score2'))
+                if match and match.score1 is None:
+                    idempotency.remember(key, 'record_match', match.id, url_for('matches'))
+                    try:
+                        match.record_score(score1, score2)
+                    except IntegrityError:
+                        # Même clé enregistrée entre-temps par une requête concurrente
+                        db.session.rollback()
+                        return _concurrent_key(key, 'record_match', match.id)
+                return redirect(url_for('matches'))
+        elif 'generate_next_round' in request.form:
+            if tournament.has_unplayed_matches():
+                error = "Il reste des matchs non joués. Veuillez enregistrer tous les résultats avant de générer le prochain tour."
+                unplayed_matches = []
+                for match in tournament.get_unplayed_matches():
+                    unplayed_matches.append({
+                        'team1': match.team1.name,
+                        'team2': match.team2.name,
+                        'match_id': match.id
+                    })
+
+                played_matches = []
+                for match in tournament.get_played_matches():
+                    played_matches.append({
+                        'team1': match.team1.name,
+                        'team2': match.team2.name,
+                        'score1': match.score1,
+                        'score2': match.score2,
+                        'date': match.date
+                    })
+
+                return render_template('matches.html', unplayed_matches=unplayed_matches, played_matches=played_matches, error=error, tournament=tournament)
+            else:
+                # Tour long à générer (anti-doublons, beaucoup d'équipes) : tâche en arrière-plan
+                job = jobs.enqueue('generate_round', url_for('matches'))
+                return redirect(url_for('jobs.detail', job_id=job.id))
+
+    # Récupérer les matchs non joués
+    unplayed_matches = []
+    matches = tournament.get_unplayed_matches()
+
+    for index, match in enumerate(matches):
+        unplayed_matches.append({
+            'team1': match.team1.name,
+            'team2': match.team2.name,
+            'match_id': match.id,
+            'table_number': match.table_number
+        })
+
+    # Récupérer les matchs joués
+    played_matches = []
+    for match in tournament.get_played_matches():
+        played_matches.append({
+            'team1': match.team1.name,
+            'team2': match.team2.name,
+            'score1': match.score1,
+            'score2': match.score2,
+            'table_number': match.table_number,
+            'date': match.date
+
+        })
+    
+    played_matches_sorted = sorted(played_matches, key=lambda x: x['date'], reverse=True)
+    return render_template('matches.html', unplayed_matches=unplayed_matches, played_matches=played_matches_sorted, is_admin=current_user.is_authenticated, current_round = tournament.get_current_round(), tournament=tournament)
+
+
+def _reused_key():
+    flash("Ce formulaire a déjà servi pour un autre match : le score n'a pas été enregistré, "
+          "saisissez-le à nouveau.", 'error')
+    return redirect(url_for('matches'))
+
+
+def _concurrent_key(key, endpoint, match_id):
+    """Answer a submission whose key was stored by a concurrent request."""
+    try:
+        previous = idempotency.lookup(key, endpoint, match_id)
+    except idempotency.KeyReused:
+        return _reused_key()
+    return redirect(previous.location if previous else url_for('matches'))
+
+
+def ranking():
+    tournament = g.tournament
+    
+    # Récupérer le classement actuel (calculé une seule fois par révision du tournoi)
+    teams = cache.get_ranking(tournament)
+
+    # Récupérer les scores par tour
+    teams_scores, round_numbers = cache.get_scores_by_round(tournament)
+
+    return render_template('ranking.html', teams=teams, teams_scores=teams_scores, round_numbers=round_numbers, tournament=tournament)
+
+
+@login_required
+def admin():
+    tournament = g.tournament
+    
+    if request.method == 'POST':
+        if 'reset_tournament' in request.form:
+            job = jobs.enqueue('reset_tournament', url_for('admin'))
+            return redirect(url_for('jobs.detail', job_id=job.id))
+
+        elif 'archive_tournament' in request.form:
+            archive_name = request.form.get('archive_name', '').strip()
+            if not archive_name:
+                flash("Le nom de l'archive est obligatoire.", 'error')
+                return redirect(url_for('admin'))
+            if not tournament.has_started():
+                flash("Aucun résultat à archiver.", 'error')
+                return redirect(url_for('admin'))
+
+            job = jobs.enqueue('archive_tournament', url_for('history'), name=archive_name)
+            return redirect(url_for('jobs.detail', job_id=job.id))
+
+        elif 'start_tournament' in request.form:
+            if len(tournament.get_teams()) % 2 != 0:
+                flash("Le nombre d'équipes doit être pair pour commencer le tournoi.", 'error')
+                return redirect(url_for('admin'))
+
+            # Save prevent_duplicate_matches setting before starting
+            prevent_duplicate = 'prevent_duplicate_matches' in request.form
+            tournament_obj = Tournament.query.first()
+            if tournament_obj:
+                tournament_obj.prevent_duplicate_matches = prevent_duplicate
+                db.session.commit()
+
+            job = jobs.enqueue('generate_round', url_for('matches'))
+            return redirect(url_for('jobs.detail', job_id=job.id))
+
+        elif 'repair_aggregates' in request.form:
+            job = jobs.enqueue('repair_aggregates', url_for('admin'))
+            return redirect(url_for('jobs.detail', job_id=job.id))
+
+        elif 'add_team' in request.form:
+            team_name = request.form.get('team_name')
+
+            if not team_name:
+                flash("Nom de l'equipe est obligatoires.", 'error')
+                return redirect(url_for('admin'))
+
+            if tournament.add_team(team_name):
+                flash(f"L'équipe {team_name} a été ajoutée avec succès.", 'success')
+            else:
+                flash("Impossible d'ajouter l'équipe. Le tournoi a peut-être déjà commencé ou l'équipe existe déjà.", 'error')
+            return redirect(url_for('admin'))
+        
+        elif 'remove_team' in request.form:
+            team_name = request.form.get('remove_team')
+
+            if not team_name:
+                flash("Noms de l'équipe non spécifié.", 'error')
+                return redirect(url_for('admin'))
+
+            if tournament.remove_team(team_name):
+                flash(f"L'équipe a été supprimée avec succès.", 'success')
+            else:
+                flash("Impossible de supprimer l'équipe. Le tournoi a peut-être déjà commencé ou l'équipe n'existe pas.", 'error')
+            return redirect(url_for('admin'))
+        
+        elif 'update_settings' in request.form:
+            ranking_system = request.form.get('ranking_system')
+            if ranking_system in ['points_sum', 'soccer_style']:
+                tournament_obj = Tournament.query.first()
+                if tournament_obj:
+                    tournament_obj.ranking_system = ranking_system
+                    db.session.add(tournament_obj)
+                    db.session.commit()
+                    flash(f"Système de classement mis à jour.", 'success')
+            return redirect(url_for('admin'))
+
+    teams = tournament.get_teams(profile='team_with_players')
+    tournament_started = tournament.has_started()
+    
+    list_non_closed_matches = tournament.get_open_dated_matches()
+    matches_not_closed = []
+    for match in list_non_closed_matches:
+        matches_not_closed.append({
+            'team1': match.team1.name,
+            'team2': match.team2.name,
+            'match_id': match.id
+        })
+    return render_template('admin.html', teams=teams, matches_not_closed=matches_not_closed, tournament=tournament, tournament_started=tournament_started)
+
+@login_required
+def update_match_result(match_id):
+    if request.method == 'POST':
+        key = idempotency.request_key()
+        try:
+            previous = idempotency.lookup(key, 'update_match_result', match_id)
+        except idempotency.KeyReused:
+            return _reused_key()
+        if previous:
+            return redirect(previous.location)
+
+        match = Match.query.get(match_id)
+        score1 = int(request.form.get('score1'))
+        score2 = int(request.form.get('score2'))
+        if not match:
+            flash("Match non trouvé.", 'error')
+            return redirect(url_for('matches'))
+        idempotency.remember(key, 'update_match_result', match.id, url_for('matches'))
+        try:
+            match.update_score(score1, score2)
+        except IntegrityError:
+            db.session.rollback()
+            return _concurrent_key(key, 'update_match_result', match.id)
+
+    return redirect(url_for('matches'))  # Remplacez par le nom de votre route
+
+
+def history():
+    query = request.args.get('player', '').strip()
+    return render_template('history.html', archives=archive.list_archives(),
+                           players=archive.player_history(query or None), query=query)
+
+
+def history_archive(archive_id):
+    archived = db.session.get(TournamentArchive, archive_id)
+    if not archived:
+        return redirect(url_for('history'))
+
+    data = archived.data
+    teams = {row[0]: row for row in data['teams']}
+    players = {}
+    for player_id, name, team_id in data['players']:
+        players.setdefault(team_id, []).append(name)
+    standings = [{
+        'rank': rank,
+        'name': teams[team_id][1],
+        'players': players.get(team_id, []),
+        'matches_played': teams[team_id][2],
+        'points_for': teams[team_id][3],
+        'points_against': teams[team_id][4],
+    } for rank, team_id in enumerate(data['standings'], start=1) if team_id in teams]
+    return render_template('archive_detail.html', archive=archived, standings=standings)
+
+
+def search():
+    query = request.args.get('q', '').strip()
+    results = team_search.search(g.tournament, query, team_search.MAX_LIMIT) if query else []
+    return render_template('search.html', query=query, results=results)
+
+
+def get_item(dictionary, key):
+    return dictionary.get(key, None)
+
+
+def register_views(app):
+    """Attach the page routes to the application (endpoints keep their historical names)."""
+    app.add_url_rule('/', 'index', index, methods=['GET'])
+    app.add_url_rule('/login', 'login', login, methods=['GET', 'POST'])
+    app.add_url_rule('/logout', 'logout', logout)
+    app.add_url_rule('/team/<int:team_id>', 'team_detail', team_detail, methods=['GET', 'POST'])
+    app.add_url_rule('/matches', 'matches', matches, methods=['GET', 'POST'])
+    app.add_url_rule('/ranking', 'ranking', ranking)
+    app.add_url_rule('/search', 'search', search)
+    app.add_url_rule('/history', 'history', history)
+    app.add_url_rule('/history/<int:archive_id>', 'history_archive', history_archive)
+    app.add_url_rule('/admin', 'admin', admin, methods=['GET', 'POST'])
+    app.add_url_rule('/update_match_result/<int:match_id>', 'update_match_result', update_match_result, methods=['POST'])
+
+    app.add_template_filter(get_item, 'get_item')